@@ -5,9 +5,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.data_version import data_version_etag
 from app.schemas.category import (
     CategoryCreate,
     CategoryUpdate,
+    CategoryOrder,
     CategoryResponse,
 )
 from app.schemas.common import MessageResponse
@@ -18,6 +20,7 @@ router = APIRouter()
 
 @router.get("/", response_model=List[CategoryResponse])
 async def get_categories(
+    etag: str = Depends(data_version_etag("categories")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all categories with service counts"""
@@ -28,6 +31,7 @@ async def get_categories(
 @router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category(
     category_id: int,
+    etag: str = Depends(data_version_etag("categories")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a single category by ID"""
@@ -98,16 +102,11 @@ async def delete_category(
 
 @router.post("/reorder", response_model=List[CategoryResponse])
 async def reorder_categories(
-    category_orders: List[dict],
+    category_orders: List[CategoryOrder],
     db: AsyncSession = Depends(get_db)
 ):
-    """Reorder categories"""
-    categories = await category_service.reorder(db, category_orders)
-    
-    # Return with service counts
-    response = []
-    for category in categories:
-        cat_with_count = await category_service.get_with_service_count(db, category.id)
-        response.append(cat_with_count)
-    
-    return response
\ No newline at end of file
+    """Reorder categories, returning all of them in the new order"""
+    try:
+        return await category_service.reorder(db, [order.model_dump() for order in category_orders])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -1,28 +1,76 @@
 """Health check API endpoints"""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from typing import List, Optional, Union
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse, Response, ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.data_version import data_version_etag
+from app.models.health_check import to_epoch_ms, to_naive_utc
 from app.schemas.health_check import (
+    HealthCheckBatchRequest,
     HealthCheckRecordResponse,
+    HealthCheckRecordPage,
     HealthCheckStatistics,
+    HealthHistoryBucket,
+    HealthHistoryBatch,
     ServiceHealthStatus,
 )
+from app.schemas.report import AvailabilityReport, AvailabilityReportRow
 from app.schemas.common import MessageResponse
 from app.services.health_check import health_check_service
+from app.services.report import report_service
 
 router = APIRouter()
 
 
 @router.get("/statistics", response_model=HealthCheckStatistics)
 async def get_health_statistics(
+    etag: Optional[str] = Depends(data_version_etag("health")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get overall health statistics"""
     stats = await health_check_service.get_health_statistics(db)
-    return stats
+    # Built from trusted rows, so encoded directly instead of revalidated
+    return ORJSONResponse(stats, headers={"ETag": etag} if etag else None)
+
+
+@router.get("/report", response_model=AvailabilityReport)
+async def get_availability_report(
+    db: AsyncSession = Depends(get_db),
+    days: int = Query(30, ge=1),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    group_by: str = Query("service", pattern="^(service|category|tag)$"),
+    format: str = Query("json", pattern="^(json|csv)$"),
+):
+    """Get availability per service, category or tag over a window (UTC, hour-aligned)"""
+    end = to_naive_utc(end) if end else datetime.utcnow()
+    start = to_naive_utc(start) if start else end - timedelta(days=days)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    
+    report = await report_service.get_availability_report(
+        db, start=start, end=end, group_by=group_by
+    )
+    
+    if format == "csv":
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(AvailabilityReportRow.model_fields))
+        writer.writeheader()
+        writer.writerows(report["rows"])
+        return Response(
+            content=output.getvalue(),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename=availability_{group_by}.csv"}
+        )
+    
+    return report
 
 
 @router.get("/service/{service_id}", response_model=ServiceHealthStatus)
@@ -38,7 +86,7 @@ async def get_service_health(
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
     
-    history = await health_check_service.get_service_health_history(db, service_id, hours)
+    history = await health_check_service.get_service_health_history(db, service_id, hours, limit=10)
     uptime = await health_check_service.calculate_uptime(db, service_id, hours)
     
     return ServiceHealthStatus(
@@ -49,19 +97,130 @@ async def get_service_health(
         last_check_time=service.last_check_time,
         last_check_status=service.last_check_status,
         uptime_percentage=uptime,
-        recent_checks=history[:10]
+        recent_checks=history
     )
 
 
-@router.get("/history/{service_id}", response_model=List[HealthCheckRecordResponse])
+@router.get("/history", response_model=HealthHistoryBatch)
+async def get_health_history_batch(
+    service_ids: str,  # Comma-separated service IDs
+    hours: int = 24,
+    bucket: str = Query("1h", pattern="^(1m|5m|1h|1d)$"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get bucketed health history for several services as compact parallel arrays"""
+    try:
+        service_id_list = list(dict.fromkeys(int(id) for id in service_ids.split(",")))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid service IDs format")
+    
+    history = await health_check_service.get_bucketed_history(db, service_id_list, hours, bucket)
+    
+    series = []
+    for service_id, points in history.items():
+        series.append({
+            "service_id": service_id,
+            "timestamps": [to_epoch_ms(point["timestamp"]) for point in points],
+            "count": [point["count"] for point in points],
+            "healthy_ratio": [point["healthy_ratio"] for point in points],
+            "min_response_time": [point["min_response_time"] for point in points],
+            "avg_response_time": [point["avg_response_time"] for point in points],
+            "max_response_time": [point["max_response_time"] for point in points],
+            "p95_response_time": [point["p95_response_time"] for point in points],
+        })
+    
+    return {"bucket": bucket, "hours": hours, "series": series}
+
+
+@router.get(
+    "/history/{service_id}",
+    response_model=Union[List[HealthCheckRecordResponse], List[HealthHistoryBucket]]
+)
 async def get_service_health_history(
+    response: Response,
     service_id: int,
     hours: int = 24,
+    bucket: Optional[str] = Query(None, pattern="^(1m|5m|1h|1d)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get health check history for a service, raw or aggregated into time buckets
+    
+    Raw records come a page at a time, newest first, like ``/records``; the
+    cursor of the next page is sent in the ``X-Next-Cursor`` header.
+    """
+    if bucket:
+        history = await health_check_service.get_bucketed_history(db, [service_id], hours, bucket)
+        return history[service_id]
+    
+    try:
+        records, next_cursor = await health_check_service.get_history_page(
+            db, service_id, limit=limit, cursor=cursor, hours=hours
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return records
+
+
+@router.get("/history/{service_id}/records", response_model=HealthCheckRecordPage)
+async def get_service_health_records(
+    service_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    hours: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get raw health check records a page at a time, newest first"""
+    try:
+        records, next_cursor = await health_check_service.get_history_page(
+            db, service_id, limit=limit, cursor=cursor, hours=hours
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"items": records, "next_cursor": next_cursor}
+
+
+@router.get("/history/{service_id}/export")
+async def export_service_health_history(
+    service_id: int,
+    hours: Optional[int] = Query(None, ge=1),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get health check history for a service"""
-    history = await health_check_service.get_service_health_history(db, service_id, hours)
-    return history
+    """Stream raw health check history as NDJSON or CSV"""
+    rows = health_check_service.stream_history(db, service_id, hours)
+    
+    if format == "csv":
+        fieldnames = list(HealthCheckRecordResponse.model_fields)
+        
+        async def stream_csv():
+            output = io.StringIO()
+            writer = csv.DictWriter(output, fieldnames=fieldnames)
+            writer.writeheader()
+            async for row in rows:
+                writer.writerow(row)
+                if output.tell() > 64 * 1024:
+                    yield output.getvalue()
+                    output.seek(0)
+                    output.truncate()
+            yield output.getvalue()
+        
+        return StreamingResponse(
+            stream_csv(),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename=health_history_{service_id}.csv"}
+        )
+    
+    async def stream_ndjson():
+        async for row in rows:
+            yield json.dumps(row) + "\n"
+    
+    return StreamingResponse(stream_ndjson(), media_type="application/x-ndjson")
 
 
 @router.post("/check", response_model=MessageResponse)
@@ -74,6 +233,37 @@ async def trigger_health_check(
     return MessageResponse(message="Health check started in background")
 
 
+@router.post("/check/batch")
+async def check_services_batch(
+    selection: HealthCheckBatchRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Check a selection of services, streaming results as NDJSON as they complete
+    
+    The selection is the union of ``service_ids``, every service in
+    ``category_ids`` and every service with any of ``tag_ids``; inactive
+    services are left out unless ``include_inactive`` is set.
+    """
+    from app.services.service import service_service
+    
+    if not (selection.service_ids or selection.category_ids or selection.tag_ids):
+        raise HTTPException(status_code=400, detail="No services selected")
+    
+    services = await service_service.get_selection(
+        db,
+        service_ids=selection.service_ids,
+        category_ids=selection.category_ids,
+        tag_ids=selection.tag_ids,
+        is_active=None if selection.include_inactive else True
+    )
+    
+    async def stream_results():
+        async for check_result in health_check_service.check_services(db, services):
+            yield json.dumps(check_result) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @router.post("/check/{service_id}", response_model=dict)
 async def check_single_service(
     service_id: int,
@@ -88,17 +278,8 @@ async def check_single_service(
     
     result = await health_check_service.check_service_health(service)
     
-    # Save result
-    from app.models.health_check import HealthCheckRecord
-    record = HealthCheckRecord(**result)
-    db.add(record)
-    
-    # Update service status
-    service.status = "active" if result["is_healthy"] == "healthy" else "inactive"
-    service.last_check_time = result["response_time"]
-    service.last_check_status = result["status_code"]
-    
-    db.add(service)
+    # Save result and update service status
+    await health_check_service.save_check_result(db, service, result)
     await db.commit()
     
     return result
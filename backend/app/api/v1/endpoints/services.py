@@ -1,26 +1,53 @@
 """Service API endpoints"""
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.data_version import data_version_etag
 from app.schemas.service import (
     ServiceCreate,
     ServiceUpdate,
     ServiceResponse,
     ServiceListResponse,
+    ServiceBulkCreateResult,
     ServiceBulkDelete,
     ServiceBulkUpdate,
+    ServiceFacets,
+    ServiceDependencyUpdate,
+    ServiceDependencies,
+    ServiceInDB,
 )
 from app.schemas.common import MessageResponse
 from app.services.service import service_service
 
 router = APIRouter()
 
+STREAM_CHUNK_ROWS = 100
+
+
+def split_list(value: str) -> List[str]:
+    """Parse a comma-separated list, ignoring spaces and empty parts"""
+    return [part for part in (part.strip() for part in value.split(",")) if part]
+
+
+def parse_tag_ids(tag_ids: Optional[str]) -> Optional[List[int]]:
+    """Parse comma-separated tag IDs"""
+    if not tag_ids:
+        return None
+    try:
+        return [int(id) for id in split_list(tag_ids)] or None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid tag IDs format")
+
 
 @router.get("/", response_model=ServiceListResponse)
 async def get_services(
+    etag: Optional[str] = Depends(data_version_etag("services")),
     db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
@@ -29,39 +56,123 @@ async def get_services(
     status: Optional[str] = None,
     is_active: Optional[bool] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    count: str = Query("exact", pattern=f"^({'|'.join(service_service.COUNT_STRATEGIES)})$"),
+    fields: Optional[str] = None,  # Comma-separated service fields
+    include: Optional[str] = None,  # Comma-separated relations: category, tags
 ):
-    """Get services with filters and pagination"""
-    # Parse tag IDs
-    tag_id_list = None
-    if tag_ids:
-        try:
-            tag_id_list = [int(id) for id in tag_ids.split(",")]
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid tag IDs format")
+    """Get services with filters and pagination
+    
+    Pass the ``next_cursor`` of a response as ``cursor`` to continue after its
+    last row; ``page`` is then ignored. ``count=cached`` reuses totals until
+    the next write and ``count=none`` skips them, leaving only ``has_more``.
+    
+    ``fields`` and ``include`` trim the items to some fields and relations;
+    without ``include`` a ``fields`` list leaves both relations out.
+    """
+    tag_id_list = parse_tag_ids(tag_ids)
+    
+    field_list = split_list(fields or "") or None
+    if field_list:
+        unknown = set(field_list) - set(ServiceInDB.model_fields)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
     
-    skip = (page - 1) * size
-    services, total = await service_service.get_multi_with_relations(
+    if include is not None:
+        include_list = split_list(include)
+        unknown = set(include_list) - set(service_service.RELATIONS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown relations: {', '.join(sorted(unknown))}")
+    else:
+        include_list = [] if field_list else list(service_service.RELATIONS)
+    
+    try:
+        body = await service_service.get_list_page(
+            db,
+            page=page,
+            size=size,
+            cursor=cursor,
+            category_id=category_id,
+            tag_ids=tag_id_list,
+            status=status,
+            is_active=is_active,
+            search=search,
+            count=count,
+            fields=field_list,
+            include=include_list
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Encoded directly rather than revalidated through ServiceListResponse,
+    # which also lets trimmed items through; the schema stays documented
+    return ORJSONResponse(body, headers={"ETag": etag} if etag else None)
+
+
+@router.get("/facets", response_model=ServiceFacets)
+async def get_service_facets(
+    etag: str = Depends(data_version_etag("services")),
+    db: AsyncSession = Depends(get_db),
+    category_id: Optional[int] = None,
+    tag_ids: Optional[str] = None,  # Comma-separated tag IDs
+    status: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    search: Optional[str] = None,
+):
+    """Count the services matching the list filters per category, tag and status"""
+    return await service_service.get_facets(
         db,
-        skip=skip,
-        limit=size,
         category_id=category_id,
-        tag_ids=tag_id_list,
+        tag_ids=parse_tag_ids(tag_ids),
         status=status,
         is_active=is_active,
         search=search
     )
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_services(
+    category_id: Optional[int] = None,
+    tag_ids: Optional[str] = None,  # Comma-separated tag IDs
+    status: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    search: Optional[str] = None,
+):
+    """Stream every service matching the list filters as NDJSON
     
-    return ServiceListResponse(
-        total=total,
-        page=page,
-        size=size,
-        items=services
-    )
+    One JSON object per line with the service fields, the category name as
+    ``category`` and the tag names as ``tags``, in ID order.
+    """
+    tag_id_list = parse_tag_ids(tag_ids)
+    
+    async def lines():
+        # The session lives as long as the stream rather than the request
+        async with AsyncSessionLocal() as db:
+            rows = service_service.stream_catalog(
+                db,
+                category_id=category_id,
+                tag_ids=tag_id_list,
+                status=status,
+                is_active=is_active,
+                search=search
+            )
+            # Sent in chunks of lines, as each chunk costs a trip through the server
+            chunk = []
+            async for row in rows:
+                chunk.append(orjson.dumps(row))
+                if len(chunk) == STREAM_CHUNK_ROWS:
+                    yield b"\n".join(chunk) + b"\n"
+                    chunk = []
+            if chunk:
+                yield b"\n".join(chunk) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/{service_id}", response_model=ServiceResponse)
 async def get_service(
     service_id: int,
+    etag: str = Depends(data_version_etag("services")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a single service by ID"""
@@ -77,7 +188,10 @@ async def create_service(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new service"""
-    return await service_service.create_with_tags(db, obj_in=service)
+    try:
+        return await service_service.create_with_tags(db, obj_in=service)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{service_id}", response_model=ServiceResponse)
@@ -91,9 +205,44 @@ async def update_service(
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
     
-    return await service_service.update_with_tags(
-        db, db_obj=service, obj_in=service_update
-    )
+    try:
+        return await service_service.update_with_tags(
+            db, db_obj=service, obj_in=service_update
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{service_id}/dependencies", response_model=ServiceDependencies)
+async def get_service_dependencies(
+    service_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get upstream and downstream dependencies of a service"""
+    service = await service_service.get(db, service_id)
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    
+    return await service_service.get_dependencies(db, service_id)
+
+
+@router.put("/{service_id}/dependencies", response_model=ServiceDependencies)
+async def update_service_dependencies(
+    service_id: int,
+    dependency_update: ServiceDependencyUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Replace the upstream dependencies of a service"""
+    service = await service_service.get(db, service_id)
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    
+    try:
+        return await service_service.set_dependencies(
+            db, service_id=service_id, depends_on=dependency_update.depends_on
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{service_id}", response_model=MessageResponse)
@@ -109,6 +258,83 @@ async def delete_service(
     return MessageResponse(message="Service deleted successfully")
 
 
+@router.post(
+    "/bulk",
+    response_model=ServiceBulkCreateResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/ServiceCreate"}}
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def bulk_create_services(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk create services from a JSON array or an NDJSON stream
+    
+    Every item is validated; valid ones are inserted together in one
+    transaction and the rest reported by their position in the request.
+    """
+    errors = []
+    items = []
+    
+    def add_item(index: int, data) -> None:
+        try:
+            items.append((index, ServiceCreate.model_validate(data)))
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+                for error in e.errors()
+            )
+            errors.append({"index": index, "detail": detail})
+    
+    index = 0
+    if "ndjson" in request.headers.get("content-type", ""):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    try:
+                        add_item(index, orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        errors.append({"index": index, "detail": "Invalid JSON"})
+                    index += 1
+        if buffer.strip():
+            try:
+                add_item(index, orjson.loads(buffer))
+            except orjson.JSONDecodeError:
+                errors.append({"index": index, "detail": "Invalid JSON"})
+            index += 1
+    else:
+        try:
+            data = orjson.loads(await request.body())
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON")
+        if not isinstance(data, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of services")
+        for index, item in enumerate(data):
+            add_item(index, item)
+        index = len(data)
+    
+    created, rejected = await service_service.bulk_create(db, items=items)
+    errors.extend(rejected)
+    
+    return ServiceBulkCreateResult(
+        created=len(created),
+        ids=[created.get(position) for position in range(index)],
+        errors=sorted(errors, key=lambda error: error["index"])
+    )
+
+
 @router.post("/bulk/delete", response_model=MessageResponse)
 async def bulk_delete_services(
     bulk_delete: ServiceBulkDelete,
@@ -138,10 +364,13 @@ async def bulk_update_services(
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
     
-    services = await service_service.bulk_update(
-        db,
-        service_ids=bulk_update.service_ids,
-        update_data=update_data
-    )
+    try:
+        services = await service_service.bulk_update(
+            db,
+            service_ids=bulk_update.service_ids,
+            update_data=update_data
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return services
\ No newline at end of file
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.data_version import data_version_etag
 from app.schemas.tag import (
     TagCreate,
     TagUpdate,
@@ -18,6 +19,7 @@ router = APIRouter()
 
 @router.get("/", response_model=List[TagResponse])
 async def get_tags(
+    etag: str = Depends(data_version_etag("tags")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all tags with service counts"""
@@ -28,6 +30,7 @@ async def get_tags(
 @router.get("/{tag_id}", response_model=TagResponse)
 async def get_tag(
     tag_id: int,
+    etag: str = Depends(data_version_etag("tags")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a single tag by ID"""
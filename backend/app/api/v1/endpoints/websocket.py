@@ -8,6 +8,7 @@ import asyncio
 from datetime import datetime
 
 from app.core.database import get_db
+from app.services.anomaly import latency_detector
 from app.services.health_check import health_check_service
 
 router = APIRouter()
@@ -129,6 +130,19 @@ async def broadcast_service_update(service_data: Dict):
     await manager.broadcast(json.dumps(message))
 
 
+async def broadcast_latency_anomaly(anomaly_data: Dict):
+    """Broadcast a latency anomaly to all connected clients"""
+    message = {
+        "type": "latency_anomaly",
+        "timestamp": datetime.utcnow().isoformat(),
+        "data": anomaly_data
+    }
+    await manager.broadcast(json.dumps(message))
+
+
+latency_detector.subscribe(broadcast_latency_anomaly)
+
+
 # Background task for periodic health checks
 async def periodic_health_check():
     """Run periodic health checks and broadcast updates"""
@@ -0,0 +1,188 @@
+"""Two-tier read-through cache for hot service-layer reads
+
+The first tier is an in-process LRU with a TTL, the second an optional
+Redis shared between workers. Entries are tagged with resource families
+and stored with the family data versions they were loaded under; a write
+to a family bumps its version, which makes every entry tagged with it
+stale in both tiers. Concurrent misses on one key share a single load.
+The local tier sees other workers' writes only once its TTL runs out.
+With Redis the shared family versions also back the data version ETags.
+
+The Redis tier only needs ``get``, ``set``, ``mget`` and ``incr`` coroutines,
+so tests can pass a local fake instead of a real client.
+"""
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+import orjson
+
+from app.core.config import settings
+from app.core.data_version import data_versions, Changes, FAMILY_TABLES
+
+logger = logging.getLogger(__name__)
+
+
+class TieredCache:
+    """LRU/TTL cache in front of an optional Redis tier"""
+    
+    def __init__(self, max_entries: int, ttl: float, redis=None, prefix: str = "cache:"):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.redis = redis
+        self.prefix = prefix
+        # Key -> (expires at, tag versions, value), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending_writes = set()
+        self.counters = {"hits": 0, "remote_hits": 0, "misses": 0, "evictions": 0, "remote_errors": 0}
+        data_versions.subscribe(self.on_commit)
+        if redis is not None:
+            data_versions.share(self.shared_versions)
+    
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "entries": len(self._entries), "inflight": len(self._inflight)}
+    
+    def on_commit(self, changes: Changes) -> None:
+        """Invalidate the shared tier for families written by a commit"""
+        if self.redis is None:
+            return
+        tables = set(changes)
+        families = [family for family, family_tables in FAMILY_TABLES.items() if tables & family_tables]
+        if families:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            task = loop.create_task(self.invalidate_remote(families))
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
+    
+    async def invalidate_remote(self, families: Sequence[str]) -> None:
+        try:
+            for family in families:
+                await self.redis.incr(self._tag_key(family))
+        except Exception as e:
+            self.counters["remote_errors"] += 1
+            logger.warning(f"Cache invalidation failed: {e}")
+    
+    async def flush(self) -> None:
+        """Wait for this process's shared-tier invalidations to land"""
+        while self._pending_writes:
+            await asyncio.gather(*self._pending_writes)
+    
+    async def shared_versions(self, families: Sequence[str]) -> list:
+        """Shared epoch followed by the shared version of each family
+        
+        The epoch lives in Redis too, so an emptied Redis restarting its
+        counters at zero cannot hand out tags issued before.
+        """
+        await self.flush()
+        keys = [self.prefix + "epoch"] + [self._tag_key(family) for family in families]
+        values = await self.redis.mget(keys)
+        if values[0] is None:
+            await self.redis.set(keys[0], secrets.token_hex(8), nx=True)
+            values = await self.redis.mget(keys)
+        epoch = values[0].decode() if isinstance(values[0], bytes) else values[0]
+        return [epoch] + [int(version or 0) for version in values[1:]]
+    
+    def _tag_key(self, family: str) -> str:
+        return f"{self.prefix}tag:{family}"
+    
+    async def get_or_load(self, key: str, tags: Sequence[str], loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value of ``key``, loading it once however many callers miss"""
+        versions = tuple(data_versions.get(tag) for tag in tags)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic() and entry[1] == versions:
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry[2]
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The loading request went away, not this one; the first
+                # waiter to retry takes over the load and the rest join it
+                return await self.get_or_load(key, tags, loader)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(key, tags, versions, loader)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+    
+    async def _load(self, key: str, tags: Sequence[str], versions: tuple, loader) -> Any:
+        remote_versions = None
+        if self.redis is not None:
+            try:
+                remote_versions = [int(version or 0) for version in await self.redis.mget(
+                    [self._tag_key(tag) for tag in tags]
+                )]
+                raw = await self.redis.get(self.prefix + key)
+                if raw is not None:
+                    cached = orjson.loads(raw)
+                    if cached["versions"] == remote_versions:
+                        self.counters["remote_hits"] += 1
+                        self._store(key, versions, cached["value"])
+                        return cached["value"]
+            except Exception as e:
+                remote_versions = None
+                self.counters["remote_errors"] += 1
+                logger.warning(f"Cache read failed: {e}")
+        
+        self.counters["misses"] += 1
+        value = await loader()
+        self._store(key, versions, value)
+        
+        if remote_versions is not None:
+            try:
+                payload = orjson.dumps({"versions": remote_versions, "value": value})
+                await self.redis.set(self.prefix + key, payload, ex=max(int(self.ttl), 1))
+            except Exception as e:
+                self.counters["remote_errors"] += 1
+                logger.warning(f"Cache write failed: {e}")
+        return value
+    
+    def _store(self, key: str, versions: tuple, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, versions, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def create_redis_client(url: Optional[str]):
+    """Redis client for the shared tier, or None when not configured"""
+    if not url:
+        return None
+    import redis.asyncio as redis
+    return redis.from_url(url)
+
+
+cache = TieredCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    ttl=settings.CACHE_TTL_SECONDS,
+    redis=create_redis_client(settings.REDIS_URL) if settings.CACHE_REDIS_ENABLED else None
+)
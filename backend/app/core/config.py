@@ -39,10 +39,21 @@ class Settings(BaseSettings):
     HEALTH_CHECK_INTERVAL: int = 300  # seconds
     HEALTH_CHECK_TIMEOUT: int = 10  # seconds
     HEALTH_CHECK_ENABLED: bool = True
+    HEALTH_CHECK_CONCURRENCY: int = 20  # max probes in flight
+    
+    # Latency anomaly detection
+    ANOMALY_EWMA_ALPHA: float = 0.1  # weight of the newest sample
+    ANOMALY_Z_THRESHOLD: float = 4.0  # std devs above the baseline
+    ANOMALY_WARMUP_CHECKS: int = 10  # samples before flagging
     
     # Redis
     REDIS_URL: Optional[str] = None
     
+    # Read-through cache
+    CACHE_TTL_SECONDS: float = 30.0
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_REDIS_ENABLED: bool = False  # share cached reads and ETag versions between workers via REDIS_URL
+    
     # Pagination
     PAGINATION_LIMIT: int = 100
     DEFAULT_PAGE_SIZE: int = 20
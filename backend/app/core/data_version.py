@@ -0,0 +1,249 @@
+"""Per-family data versions, bumped whenever a commit writes to a family
+
+Sessions record the rows touched by flushes and the tables touched by DML
+statements, including tables reached through ON DELETE rules; on commit the families owning those tables get a new version
+and subscribers are told what changed. Readers use the versions to tell
+whether anything derived from a family is still current, and GET endpoints
+expose them as weak ETags so unchanged polls get a 304 without a query.
+
+The counters only see this process's own commits. When a shared source is
+registered (the Redis tier of the cache) ETags come from the shared
+versions, which every worker and maintenance script advances; without one
+the server must run as a single process, which ``claim_single_process``
+enforces, and writes made outside it need a restart to show up in ETags.
+"""
+
+import hashlib
+import logging
+import os
+import secrets
+import tempfile
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event, inspect, Table
+from sqlalchemy.orm import Session, ORMExecuteState
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Resource family -> tables whose writes change it
+FAMILY_TABLES: Dict[str, Set[str]] = {
+    "services": {"services", "service_tags", "service_dependencies", "categories", "tags"},
+    "categories": {"categories", "services"},
+    "tags": {"tags", "service_tags"},
+    "health": {"health_check_records", "health_check_rollups", "service_incidents", "services"},
+}
+
+# Association tables whose changes are recorded by one of their columns,
+# which must reference the table of the owning rows
+ROW_KEYS: Dict[str, str] = {
+    "service_tags": "service_id",
+}
+
+# Table name -> primary keys (or ROW_KEYS column values) of changed rows,
+# or None when not known. DML statements are unknown unless they name their
+# rows with the ``changed_rows`` execution option.
+Changes = Dict[str, Optional[Set[int]]]
+
+
+class DataVersions:
+    """Monotonic version counters per resource family"""
+    
+    def __init__(self):
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._subscribers: List[Callable[[Changes], None]] = []
+        # Versions restart with the process, so tags also carry a start nonce
+        self.epoch = format(time.time_ns() // 1000, "x") + secrets.token_hex(4)
+        self._shared: Optional[Callable[[Sequence[str]], Awaitable[Sequence]]] = None
+        self._lock_file = None
+    
+    def get(self, family: str) -> int:
+        return self._versions[family]
+    
+    def share(self, source: Callable[[Sequence[str]], Awaitable[Sequence]]) -> None:
+        """Take ETag versions from ``source``, shared by every process writing
+        
+        ``source`` returns an epoch followed by one version per family.
+        """
+        self._shared = source
+    
+    @property
+    def shared(self) -> bool:
+        return self._shared is not None
+    
+    async def etag(self, *families: str) -> str:
+        """Weak ETag of the current versions of some families"""
+        if self._shared is not None:
+            versions = await self._shared(families)
+        else:
+            versions = [self.epoch] + [self._versions[family] for family in families]
+        return 'W/"' + "-".join(str(version) for version in versions) + '"'
+    
+    def claim_single_process(self, key: str) -> None:
+        """Fail unless this is the only process serving ``key``
+        
+        Local counters cannot see other processes' writes, so without a
+        shared source a second worker on the same database would hand out
+        ETags that survive the first one's writes.
+        """
+        if self._lock_file is not None or fcntl is None:
+            return
+        name = hashlib.sha1(key.encode()).hexdigest()[:16]
+        lock_file = open(os.path.join(tempfile.gettempdir(), f"service-nav-{name}.lock"), "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise RuntimeError(
+                "Another process is already serving this database; run a single "
+                "worker or set CACHE_REDIS_ENABLED and REDIS_URL to share data versions"
+            )
+        self._lock_file = lock_file
+    
+    def release_process(self) -> None:
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+    
+    def subscribe(self, callback: Callable[[Changes], None]) -> None:
+        """Call ``callback`` with the changes of every committed write"""
+        self._subscribers.append(callback)
+    
+    def bump(self, changes: Changes) -> None:
+        """Advance every family that owns one of the changed tables"""
+        tables = set(changes)
+        for family, family_tables in FAMILY_TABLES.items():
+            if tables & family_tables:
+                self._versions[family] += 1
+        for callback in self._subscribers:
+            callback(changes)
+
+
+data_versions = DataVersions()
+
+
+def data_version_etag(*families: str):
+    """Dependency answering 304 when the client holds the current ETag
+    
+    Otherwise sets the ETag on the response and returns it, for endpoints
+    that build their own response object; ``None`` when the shared versions
+    cannot be read.
+    """
+    async def check(request: Request, response: Response) -> Optional[str]:
+        try:
+            etag = await data_versions.etag(*families)
+        except Exception as e:
+            # Without current versions no tag can be trusted, so send none
+            logger.warning(f"Data versions unavailable: {e}")
+            return None
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            held = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in held or etag.removeprefix("W/") in held:
+                raise HTTPException(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return etag
+    
+    return check
+
+
+def _changes(session: Session) -> Changes:
+    return session.info.setdefault("changes", {})
+
+
+def _add_rows(changes: Changes, table: str, rows) -> None:
+    if rows is None:
+        changes[table] = None
+        return
+    recorded = changes.setdefault(table, set())
+    if recorded is not None:
+        recorded.update(rows)
+
+
+def record_rows(session: Session, table: str, rows) -> None:
+    """Record rows changed by a statement that only named them once it ran
+    
+    For statements executed with an empty ``changed_rows``, such as inserts
+    whose keys come back through RETURNING.
+    """
+    _add_rows(_changes(session), table, rows)
+
+
+def _keyed_by(name: str, table: Table) -> bool:
+    """Whether rows of ``name`` are recorded by the keys of rows in ``table``"""
+    key = ROW_KEYS.get(name)
+    if key is None:
+        return False
+    column = table.metadata.tables[name].c[key]
+    return any(fk.column.table.name == table.name for fk in column.foreign_keys)
+
+
+@lru_cache(maxsize=None)
+def cascaded_tables(table: Table) -> Set[str]:
+    """Tables the database changes through ON DELETE rules when rows of ``table`` go"""
+    names = set()
+    for other in table.metadata.tables.values():
+        for fk in other.foreign_keys:
+            if fk.ondelete and fk.column.table.name == table.name and other.name not in names:
+                names.add(other.name)
+                if other.name != table.name:
+                    names |= cascaded_tables(other)
+    return names
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session: Session, flush_context) -> None:
+    # The new/dirty/deleted collections still hold the flushed objects here
+    changes = _changes(session)
+    deleted = list(session.deleted)
+    for obj in list(session.new) + list(session.dirty) + deleted:
+        state = inspect(obj)
+        mapper = state.mapper
+        identity = mapper.primary_key_from_instance(obj)
+        rows = [identity[0]] if len(identity) == 1 and identity[0] is not None else None
+        for table in mapper.tables:
+            _add_rows(changes, table.name, rows)
+        # Association rows written through many-to-many collections
+        for relationship in mapper.relationships:
+            if relationship.secondary is not None and state.attrs[relationship.key].history.has_changes():
+                owned = any(_keyed_by(relationship.secondary.name, table) for table in mapper.tables)
+                _add_rows(changes, relationship.secondary.name, rows if owned else None)
+    for obj in deleted:
+        mapper = inspect(obj).mapper
+        identity = mapper.primary_key_from_instance(obj)
+        rows = [identity[0]] if len(identity) == 1 and identity[0] is not None else None
+        for table in mapper.tables:
+            for name in cascaded_tables(table):
+                _add_rows(changes, name, rows if _keyed_by(name, table) else None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_statement(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            changes = _changes(state.session)
+            rows = state.execution_options.get("changed_rows")
+            _add_rows(changes, table.name, rows)
+            if state.is_delete:
+                for name in cascaded_tables(table):
+                    _add_rows(changes, name, rows if _keyed_by(name, table) else None)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_versions(session: Session) -> None:
+    changes = session.info.pop("changes", None)
+    if changes:
+        data_versions.bump(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop("changes", None)
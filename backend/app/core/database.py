@@ -1,7 +1,9 @@
 """Database configuration and session management"""
 
 from typing import AsyncGenerator
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
 
@@ -15,6 +17,15 @@ engine = create_async_engine(
     poolclass=NullPool if "sqlite" in settings.DATABASE_URL else None,
 )
 
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        """Enforce foreign keys, so ON DELETE rules run as on other databases"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.close()
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -35,4 +46,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+def dialect_insert(db: AsyncSession):
+    """Get the INSERT construct with ON CONFLICT support for the session's database"""
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
\ No newline at end of file
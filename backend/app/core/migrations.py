@@ -0,0 +1,181 @@
+"""Schema migrations applied at startup
+
+Tables are otherwise created with ``Base.metadata.create_all``, which never
+alters existing tables; each function here upgrades one table in place and
+is a no-op once the table is current.
+"""
+
+from sqlalchemy import inspect, text, select, insert, func, case, literal
+from sqlalchemy.engine import Connection
+
+
+def migrate_health_check_records(conn: Connection) -> None:
+    """Convert legacy health_check_records rows to the compact layout"""
+    from app.models.health_check import HealthCheckRecord, HealthCheckError
+    
+    inspector = inspect(conn)
+    if "health_check_records" not in inspector.get_table_names():
+        return
+    columns = {column["name"] for column in inspector.get_columns("health_check_records")}
+    if "is_healthy" not in columns:
+        return
+    
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        checked_at = "CAST(ROUND((julianday(created_at) - 2440587.5) * 86400000) AS INTEGER)"
+    elif dialect == "postgresql":
+        checked_at = "CAST(ROUND(EXTRACT(EPOCH FROM created_at) * 1000) AS BIGINT)"
+    else:
+        raise RuntimeError(f"No health_check_records migration for dialect '{dialect}'")
+    
+    message = f"SUBSTR(error_message, 1, {HealthCheckError.MAX_LENGTH})"
+    
+    # Park the legacy rows, then recreate the table with the new layout
+    conn.execute(text("CREATE TABLE health_check_records_legacy AS SELECT * FROM health_check_records"))
+    conn.execute(text("DROP TABLE health_check_records"))
+    HealthCheckError.__table__.create(conn, checkfirst=True)
+    HealthCheckRecord.__table__.create(conn)
+    
+    conn.execute(text(f"""
+        INSERT INTO health_check_errors (message)
+        SELECT DISTINCT {message} FROM health_check_records_legacy
+        WHERE error_message IS NOT NULL
+        AND {message} NOT IN (SELECT message FROM health_check_errors)
+    """))
+    conn.execute(text(f"""
+        INSERT INTO health_check_records
+            (id, service_id, checked_at, status, status_code, response_time, error_id)
+        SELECT
+            legacy.id,
+            legacy.service_id,
+            {checked_at},
+            CASE legacy.is_healthy WHEN 'healthy' THEN 1 WHEN 'timeout' THEN 2 ELSE 0 END,
+            legacy.status_code,
+            legacy.response_time,
+            errors.id
+        FROM health_check_records_legacy AS legacy
+        LEFT JOIN health_check_errors AS errors ON errors.message = {message.replace("error_message", "legacy.error_message")}
+    """))
+    
+    if dialect == "postgresql":
+        conn.execute(text(
+            "SELECT setval(pg_get_serial_sequence('health_check_records', 'id'), "
+            "COALESCE((SELECT MAX(id) FROM health_check_records), 0) + 1, false)"
+        ))
+    
+    conn.execute(text("DROP TABLE health_check_records_legacy"))
+
+
+def backfill_health_check_rollups(conn: Connection) -> None:
+    """Build rollups and incidents from existing health check records"""
+    from app.models.health_check import (
+        HealthCheckRecord,
+        HealthCheckRollup,
+        HealthStatus,
+        ServiceIncident,
+        LATENCY_BUCKET_COLUMNS,
+        bucket_start_expression,
+        latency_bucket_counts,
+    )
+    
+    tables = inspect(conn).get_table_names()
+    if "health_check_rollups" in tables or "health_check_records" not in tables:
+        return
+    
+    HealthCheckRollup.__table__.create(conn)
+    ServiceIncident.__table__.create(conn, checkfirst=True)
+    
+    records = HealthCheckRecord.__table__.c
+    healthy = records.status == HealthStatus.HEALTHY
+    latency = case((healthy, records.response_time))
+    
+    def count_if(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+    
+    bucket_counts = latency_bucket_counts(healthy, records.response_time)
+    
+    for resolution in HealthCheckRollup.RESOLUTIONS:
+        bucket_start = bucket_start_expression(records.checked_at, resolution)
+        conn.execute(
+            insert(HealthCheckRollup.__table__).from_select(
+                [
+                    "resolution", "bucket_start", "service_id", "total_checks", "healthy_checks",
+                    "latency_count", "latency_sum", "latency_min", "latency_max",
+                    *LATENCY_BUCKET_COLUMNS,
+                ],
+                select(
+                    literal(resolution),
+                    bucket_start,
+                    records.service_id,
+                    func.count(),
+                    count_if(healthy),
+                    func.count(latency),
+                    func.coalesce(func.sum(latency), 0.0),
+                    func.min(latency),
+                    func.max(latency),
+                    *bucket_counts,
+                ).group_by(bucket_start, records.service_id)
+            )
+        )
+    
+    # Incidents are runs of consecutive non-healthy records per service
+    incidents = []
+    service_ids = conn.execute(select(records.service_id).distinct()).scalars().all()
+    for service_id in service_ids:
+        started_at = None
+        rows = conn.execute(
+            select(records.checked_at, records.status)
+            .where(records.service_id == service_id)
+            .order_by(records.checked_at)
+        )
+        for checked_at, status in rows:
+            if status != HealthStatus.HEALTHY and started_at is None:
+                started_at = checked_at
+            elif status == HealthStatus.HEALTHY and started_at is not None:
+                incidents.append({"service_id": service_id, "started_at": started_at, "resolved_at": checked_at})
+                started_at = None
+        if started_at is not None:
+            incidents.append({"service_id": service_id, "started_at": started_at, "resolved_at": None})
+    
+    if incidents:
+        conn.execute(insert(ServiceIncident.__table__), incidents)
+
+
+def create_missing_indexes(conn: Connection) -> None:
+    """Add indexes declared on the models to tables that already exist"""
+    from app.core.database import Base
+    
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+
+
+def add_service_count_columns(conn: Connection) -> None:
+    """Add the maintained service_count to categories and tags, counting existing services"""
+    from app.services.service_counts import service_counts
+    
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    added = False
+    for table in ("categories", "tags"):
+        if table not in tables:
+            continue
+        if "service_count" not in {column["name"] for column in inspector.get_columns(table)}:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN service_count INTEGER NOT NULL DEFAULT 0"))
+            added = True
+    if added:
+        service_counts.repair(conn)
+
+
+def run_migrations(conn: Connection) -> None:
+    """Upgrade existing tables to the current schema"""
+    migrate_health_check_records(conn)
+    backfill_health_check_rollups(conn)
+    create_missing_indexes(conn)
+    add_service_count_columns(conn)
@@ -0,0 +1,39 @@
+"""Opaque cursor tokens for keyset pagination"""
+
+import base64
+import json
+from typing import Any, List, Tuple
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key of the last row of a page as a cursor token"""
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    """Decode a cursor token back into sort key values"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def keyset_filter(keys: List[Tuple[Any, bool]], values: List[Any]):
+    """Filter selecting rows strictly after a cursor position
+    
+    ``keys`` are ``(column, descending)`` pairs in sort order and ``values``
+    the decoded cursor, one value per key.
+    """
+    clauses = []
+    for index, (column, descending) in enumerate(keys):
+        after = column < values[index] if descending else column > values[index]
+        clauses.append(and_(*[
+            keys[previous][0] == values[previous] for previous in range(index)
+        ], after))
+    return or_(*clauses)
@@ -9,7 +9,13 @@ import time
 from datetime import datetime
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.cache import cache
+from app.core.data_version import data_versions
+from app.core.database import engine, Base, AsyncSessionLocal
+from app.core.migrations import run_migrations
+from app.services.search import search_index
+from app.services.bitmap_index import service_bitmap_index
+from app.services.service_counts import service_counts
 from app.api.v1 import api_router
 from app.api.v1.endpoints.websocket import periodic_health_check
 
@@ -23,9 +29,23 @@ async def lifespan(app: FastAPI):
     # Startup
     print("Starting up...")
     
-    # Create database tables
+    # ETags come from local counters unless Redis shares them
+    if not data_versions.shared:
+        data_versions.claim_single_process(settings.DATABASE_URL)
+    
+    # Upgrade existing tables, then create any missing ones
     async with engine.begin() as conn:
+        await conn.run_sync(run_migrations)
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(search_index.install)
+        await conn.run_sync(service_counts.install)
+    
+    # Migrations may have rewritten tables other workers are serving
+    data_versions.bump({name: None for name in Base.metadata.tables})
+    await cache.flush()
+    
+    async with AsyncSessionLocal() as db:
+        await service_bitmap_index.rebuild(db)
     
     # Start background tasks if enabled
     if settings.HEALTH_CHECK_ENABLED:
@@ -37,6 +57,7 @@ async def lifespan(app: FastAPI):
     print("Shutting down...")
     if settings.HEALTH_CHECK_ENABLED:
         task.cancel()
+    data_versions.release_process()
 
 
 # Create FastAPI app
@@ -90,6 +111,7 @@ async def health_check():
             "version": settings.APP_VERSION,
             "database": db_status,
             "uptime": uptime,
+            "cache": cache.stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
     )
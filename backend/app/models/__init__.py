@@ -1,15 +1,26 @@
 """Database models"""
 
-from app.models.service import Service, ServiceTag, service_tags
+from app.models.service import Service, ServiceTag, service_tags, service_dependencies
 from app.models.category import Category
-from app.models.health_check import HealthCheckRecord
+from app.models.health_check import (
+    HealthCheckRecord,
+    HealthCheckError,
+    HealthCheckRollup,
+    HealthStatus,
+    ServiceIncident,
+)
 from app.models.config import ConfigVersion
 
 __all__ = [
     "Service",
     "ServiceTag",
     "service_tags",
+    "service_dependencies",
     "Category",
     "HealthCheckRecord",
+    "HealthCheckError",
+    "HealthCheckRollup",
+    "HealthStatus",
+    "ServiceIncident",
     "ConfigVersion",
 ]
\ No newline at end of file
@@ -15,9 +15,11 @@ class Category(BaseModel):
     color = Column(String(7), nullable=True)  # Hex color code
     description = Column(Text, nullable=True)
     sort_order = Column(Integer, default=0, nullable=False)
+    service_count = Column(Integer, default=0, server_default="0", nullable=False)  # Kept by database triggers
     
     # Relationships
-    services = relationship("Service", back_populates="category", cascade="all, delete-orphan")
+    # Deleted with the category by CategoryService.delete, never loaded for it
+    services = relationship("Service", back_populates="category", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<Category(id={self.id}, name='{self.name}')>"
\ No newline at end of file
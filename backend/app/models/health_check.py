@@ -1,23 +1,208 @@
 """Health check record model"""
 
-from sqlalchemy import Column, Integer, Float, ForeignKey, String, Text
+import enum
+import time
+from datetime import datetime, timezone
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    SmallInteger,
+    Float,
+    ForeignKey,
+    String,
+    Index,
+    PrimaryKeyConstraint,
+    and_,
+    case,
+    func,
+    literal_column,
+)
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.core.database import Base
 
 
-class HealthCheckRecord(BaseModel):
-    """Health check record for services"""
+def to_naive_utc(value: datetime) -> datetime:
+    """Naive UTC datetime of a naive (taken as UTC) or timezone-aware one"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_epoch_ms(value: datetime) -> int:
+    """Convert a naive UTC or timezone-aware datetime to epoch milliseconds"""
+    return int((to_naive_utc(value) - datetime(1970, 1, 1)).total_seconds() * 1000)
+
+
+def now_epoch_ms() -> int:
+    """Current time in epoch milliseconds"""
+    return int(time.time() * 1000)
+
+
+HOUR_MS = 3600 * 1000
+DAY_MS = 24 * HOUR_MS
+
+# Upper bounds (ms) of the latency histogram kept in rollups; the last
+# column counts everything above the final bound
+LATENCY_BUCKET_BOUNDS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+LATENCY_BUCKET_COLUMNS = tuple(f"latency_le_{bound}" for bound in LATENCY_BUCKET_BOUNDS) + (
+    f"latency_gt_{LATENCY_BUCKET_BOUNDS[-1]}",
+)
+
+
+def latency_bucket_column(response_time: float) -> str:
+    """Name of the histogram column counting a response time"""
+    for bound, column in zip(LATENCY_BUCKET_BOUNDS, LATENCY_BUCKET_COLUMNS):
+        if response_time <= bound:
+            return column
+    return LATENCY_BUCKET_COLUMNS[-1]
+
+
+def bucket_start_expression(column, width_ms: int):
+    """SQL expression flooring an epoch-millisecond column to a bucket boundary"""
+    # Inline the width so the expression compiles identically in SELECT and GROUP BY
+    width = literal_column(str(int(width_ms)))
+    return column - column % width
+
+
+def latency_bucket_counts(healthy, response_time) -> list:
+    """SQL sums counting healthy response times into each histogram bucket"""
+    counts = []
+    lower = None
+    for bound in LATENCY_BUCKET_BOUNDS + (None,):
+        condition = [healthy, response_time.isnot(None)]
+        if lower is not None:
+            condition.append(response_time > lower)
+        if bound is not None:
+            condition.append(response_time <= bound)
+        counts.append(func.coalesce(func.sum(case((and_(*condition), 1), else_=0)), 0))
+        lower = bound
+    return counts
+
+
+class HealthStatus(enum.IntEnum):
+    """Stored health check outcome"""
+    
+    UNHEALTHY = 0
+    HEALTHY = 1
+    TIMEOUT = 2
+    
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+    
+    @classmethod
+    def from_label(cls, label: str) -> "HealthStatus":
+        return cls[label.upper()]
+
+
+class HealthCheckError(Base):
+    """Interned health check error message"""
+    
+    __tablename__ = "health_check_errors"
+    
+    MAX_LENGTH = 500
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    message = Column(String(MAX_LENGTH), nullable=False, unique=True)
+    
+    def __repr__(self):
+        return f"<HealthCheckError(id={self.id}, message='{self.message}')>"
+
+
+class HealthCheckRecord(Base):
+    """Health check record for services
+    
+    Stored compactly: epoch-millisecond timestamp, small-integer status and
+    a reference into the interned error table. ``created_at``, ``is_healthy``
+    and ``error_message`` are exposed as read-only properties.
+    """
     
     __tablename__ = "health_check_records"
+    __table_args__ = (
+        Index("ix_health_check_records_service_checked", "service_id", "checked_at"),
+        Index("ix_health_check_records_checked", "checked_at"),
+    )
     
+    id = Column(Integer, primary_key=True, autoincrement=True)
     service_id = Column(Integer, ForeignKey('services.id', ondelete='CASCADE'), nullable=False)
-    status_code = Column(Integer, nullable=True)  # HTTP status code
+    checked_at = Column(BigInteger, default=now_epoch_ms, nullable=False)  # Epoch milliseconds
+    status = Column(SmallInteger, nullable=False)  # HealthStatus
+    status_code = Column(SmallInteger, nullable=True)  # HTTP status code
     response_time = Column(Float, nullable=True)  # Response time in milliseconds
-    is_healthy = Column(String(20), nullable=False)  # healthy, unhealthy, timeout
-    error_message = Column(Text, nullable=True)
+    error_id = Column(Integer, ForeignKey('health_check_errors.id'), nullable=True)
     
     # Relationships
     service = relationship("Service", back_populates="health_checks")
+    error = relationship("HealthCheckError", lazy="joined")
+    
+    @property
+    def created_at(self) -> datetime:
+        return datetime.utcfromtimestamp(self.checked_at / 1000)
+    
+    @property
+    def is_healthy(self) -> str:
+        return HealthStatus(self.status).label
+    
+    @property
+    def error_message(self):
+        return self.error.message if self.error is not None else None
+    
+    def __repr__(self):
+        return f"<HealthCheckRecord(id={self.id}, service_id={self.service_id}, is_healthy={self.is_healthy})>"
+
+
+class HealthCheckRollup(Base):
+    """Per-service health check aggregates for one hour or one day"""
+    
+    __tablename__ = "health_check_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("resolution", "bucket_start", "service_id"),
+        Index("ix_health_check_rollups_service", "service_id", "resolution", "bucket_start"),
+    )
+    
+    RESOLUTIONS = (HOUR_MS, DAY_MS)
+    
+    resolution = Column(BigInteger, nullable=False)  # Bucket width in milliseconds
+    bucket_start = Column(BigInteger, nullable=False)  # Epoch milliseconds
+    service_id = Column(Integer, ForeignKey('services.id', ondelete='CASCADE'), nullable=False)
+    total_checks = Column(Integer, default=0, nullable=False)
+    healthy_checks = Column(Integer, default=0, nullable=False)
+    
+    # Latency of healthy checks
+    latency_count = Column(Integer, default=0, nullable=False)
+    latency_sum = Column(Float, default=0.0, nullable=False)
+    latency_min = Column(Float, nullable=True)
+    latency_max = Column(Float, nullable=True)
+    latency_le_10 = Column(Integer, default=0, nullable=False)
+    latency_le_25 = Column(Integer, default=0, nullable=False)
+    latency_le_50 = Column(Integer, default=0, nullable=False)
+    latency_le_100 = Column(Integer, default=0, nullable=False)
+    latency_le_250 = Column(Integer, default=0, nullable=False)
+    latency_le_500 = Column(Integer, default=0, nullable=False)
+    latency_le_1000 = Column(Integer, default=0, nullable=False)
+    latency_le_2500 = Column(Integer, default=0, nullable=False)
+    latency_le_5000 = Column(Integer, default=0, nullable=False)
+    latency_le_10000 = Column(Integer, default=0, nullable=False)
+    latency_gt_10000 = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<HealthCheckRollup(service_id={self.service_id}, resolution={self.resolution}, bucket_start={self.bucket_start})>"
+
+
+class ServiceIncident(Base):
+    """Period during which a service was down"""
+    
+    __tablename__ = "service_incidents"
+    __table_args__ = (
+        Index("ix_service_incidents_service_started", "service_id", "started_at"),
+        Index("ix_service_incidents_started", "started_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    service_id = Column(Integer, ForeignKey('services.id', ondelete='CASCADE'), nullable=False)
+    started_at = Column(BigInteger, nullable=False)  # Epoch milliseconds
+    resolved_at = Column(BigInteger, nullable=True)  # Epoch milliseconds, null while open
     
     def __repr__(self):
-        return f"<HealthCheckRecord(id={self.id}, service_id={self.service_id}, is_healthy={self.is_healthy})>"
\ No newline at end of file
+        return f"<ServiceIncident(id={self.id}, service_id={self.service_id}, started_at={self.started_at})>"
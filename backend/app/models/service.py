@@ -1,6 +1,6 @@
 """Service model"""
 
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Table, Boolean, Float
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Table, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from app.core.database import Base
@@ -9,8 +9,16 @@ from app.core.database import Base
 service_tags = Table(
     'service_tags',
     Base.metadata,
-    Column('service_id', Integer, ForeignKey('services.id', ondelete='CASCADE')),
-    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'))
+    Column('service_id', Integer, ForeignKey('services.id', ondelete='CASCADE'), index=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), index=True)
+)
+
+# Association table for service -> upstream service dependencies
+service_dependencies = Table(
+    'service_dependencies',
+    Base.metadata,
+    Column('service_id', Integer, ForeignKey('services.id', ondelete='CASCADE'), primary_key=True),
+    Column('depends_on_id', Integer, ForeignKey('services.id', ondelete='CASCADE'), primary_key=True, index=True)
 )
 
 
@@ -23,7 +31,7 @@ class Service(BaseModel):
     url = Column(String(500), nullable=False)
     description = Column(Text, nullable=True)
     category_id = Column(Integer, ForeignKey('categories.id', ondelete='SET NULL'), nullable=True)
-    status = Column(String(20), default='unknown', nullable=False)  # active, inactive, unknown
+    status = Column(String(20), default='unknown', nullable=False)  # active, inactive, unknown, upstream_down
     is_active = Column(Boolean, default=True, nullable=False)
     icon = Column(String(500), nullable=True)  # Icon URL or class
     sort_order = Column(Integer, default=0, nullable=False)
@@ -35,13 +43,40 @@ class Service(BaseModel):
     
     # Relationships
     category = relationship("Category", back_populates="services")
-    tags = relationship("ServiceTag", secondary=service_tags, back_populates="services")
-    health_checks = relationship("HealthCheckRecord", back_populates="service", cascade="all, delete-orphan")
+    # passive_deletes leaves child rows to the ON DELETE rules instead of loading them
+    tags = relationship("ServiceTag", secondary=service_tags, back_populates="services", passive_deletes=True)
+    health_checks = relationship(
+        "HealthCheckRecord", back_populates="service", cascade="all, delete-orphan", passive_deletes=True
+    )
+    dependencies = relationship(
+        "Service",
+        secondary=service_dependencies,
+        primaryjoin=lambda: Service.id == service_dependencies.c.service_id,
+        secondaryjoin=lambda: Service.id == service_dependencies.c.depends_on_id,
+        back_populates="dependents",
+        passive_deletes=True
+    )
+    dependents = relationship(
+        "Service",
+        secondary=service_dependencies,
+        primaryjoin=lambda: Service.id == service_dependencies.c.depends_on_id,
+        secondaryjoin=lambda: Service.id == service_dependencies.c.service_id,
+        back_populates="dependencies",
+        passive_deletes=True
+    )
     
     def __repr__(self):
         return f"<Service(id={self.id}, name='{self.name}', url='{self.url}')>"
 
 
+# Composite indexes matching the service list order, for keyset pagination
+Index("ix_services_list_order", Service.sort_order, Service.created_at.desc(), Service.id.desc())
+Index(
+    "ix_services_category_list_order",
+    Service.category_id, Service.sort_order, Service.created_at.desc(), Service.id.desc()
+)
+
+
 class ServiceTag(BaseModel):
     """Tag model for services"""
     
@@ -49,9 +84,10 @@ class ServiceTag(BaseModel):
     
     name = Column(String(50), nullable=False, unique=True, index=True)
     color = Column(String(7), nullable=True)  # Hex color code
+    service_count = Column(Integer, default=0, server_default="0", nullable=False)  # Kept by database triggers
     
     # Relationships
-    services = relationship("Service", secondary=service_tags, back_populates="tags")
+    services = relationship("Service", secondary=service_tags, back_populates="tags", passive_deletes=True)
     
     def __repr__(self):
         return f"<ServiceTag(id={self.id}, name='{self.name}')>"
\ No newline at end of file
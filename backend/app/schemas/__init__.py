@@ -7,13 +7,19 @@ from app.schemas.service import (
     ServiceInDB,
     ServiceResponse,
     ServiceListResponse,
+    ServiceBulkCreateError,
+    ServiceBulkCreateResult,
     ServiceBulkDelete,
     ServiceBulkUpdate,
+    ServiceFacets,
+    ServiceDependencyUpdate,
+    ServiceDependencies,
 )
 from app.schemas.category import (
     CategoryBase,
     CategoryCreate,
     CategoryUpdate,
+    CategoryOrder,
     CategoryInDB,
     CategoryResponse,
 )
@@ -27,8 +33,17 @@ from app.schemas.tag import (
 from app.schemas.health_check import (
     HealthCheckRecordBase,
     HealthCheckRecordCreate,
+    HealthCheckBatchRequest,
     HealthCheckRecordResponse,
+    HealthCheckRecordPage,
     HealthCheckStatistics,
+    HealthHistoryBucket,
+    HealthHistorySeries,
+    HealthHistoryBatch,
+)
+from app.schemas.report import (
+    AvailabilityReportRow,
+    AvailabilityReport,
 )
 from app.schemas.config import (
     ConfigExport,
@@ -49,12 +64,18 @@ __all__ = [
     "ServiceInDB",
     "ServiceResponse",
     "ServiceListResponse",
+    "ServiceBulkCreateError",
+    "ServiceBulkCreateResult",
     "ServiceBulkDelete",
     "ServiceBulkUpdate",
+    "ServiceFacets",
+    "ServiceDependencyUpdate",
+    "ServiceDependencies",
     # Category
     "CategoryBase",
     "CategoryCreate",
     "CategoryUpdate",
+    "CategoryOrder",
     "CategoryInDB",
     "CategoryResponse",
     # Tag
@@ -66,8 +87,16 @@ __all__ = [
     # Health Check
     "HealthCheckRecordBase",
     "HealthCheckRecordCreate",
+    "HealthCheckBatchRequest",
     "HealthCheckRecordResponse",
+    "HealthCheckRecordPage",
     "HealthCheckStatistics",
+    "HealthHistoryBucket",
+    "HealthHistorySeries",
+    "HealthHistoryBatch",
+    # Report
+    "AvailabilityReportRow",
+    "AvailabilityReport",
     # Config
     "ConfigExport",
     "ConfigImport",
@@ -28,6 +28,12 @@ class CategoryUpdate(BaseModel):
     sort_order: Optional[int] = None
 
 
+class CategoryOrder(BaseModel):
+    """New sort order of one category"""
+    id: int
+    sort_order: int
+
+
 class CategoryInDB(CategoryBase):
     """Category stored in database"""
     id: int
@@ -19,6 +19,14 @@ class HealthCheckRecordCreate(HealthCheckRecordBase):
     pass
 
 
+class HealthCheckBatchRequest(BaseModel):
+    """Selection of services to check in one batch"""
+    service_ids: Optional[List[int]] = None
+    category_ids: Optional[List[int]] = None
+    tag_ids: Optional[List[int]] = None
+    include_inactive: bool = False
+
+
 class HealthCheckRecordResponse(HealthCheckRecordBase):
     """Health check record response schema"""
     id: int
@@ -27,6 +35,39 @@ class HealthCheckRecordResponse(HealthCheckRecordBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class HealthHistoryBucket(BaseModel):
+    """Aggregated health checks for one time bucket
+    
+    Response time figures cover healthy checks only.
+    """
+    timestamp: datetime
+    count: int
+    healthy_ratio: float
+    min_response_time: Optional[float] = None
+    avg_response_time: Optional[float] = None
+    max_response_time: Optional[float] = None
+    p95_response_time: Optional[float] = None
+
+
+class HealthHistorySeries(BaseModel):
+    """Bucketed health history of one service as parallel arrays"""
+    service_id: int
+    timestamps: List[int] = []  # Bucket starts in epoch milliseconds
+    count: List[int] = []
+    healthy_ratio: List[float] = []
+    min_response_time: List[Optional[float]] = []
+    avg_response_time: List[Optional[float]] = []
+    max_response_time: List[Optional[float]] = []
+    p95_response_time: List[Optional[float]] = []
+
+
+class HealthHistoryBatch(BaseModel):
+    """Bucketed health history for several services"""
+    bucket: str
+    hours: int
+    series: List[HealthHistorySeries] = []
+
+
 class ServiceHealthStatus(BaseModel):
     """Service health status"""
     service_id: int
@@ -39,6 +80,12 @@ class ServiceHealthStatus(BaseModel):
     recent_checks: List[HealthCheckRecordResponse] = []
 
 
+class HealthCheckRecordPage(BaseModel):
+    """One keyset page of health check records"""
+    items: List[HealthCheckRecordResponse] = []
+    next_cursor: Optional[str] = None
+
+
 class HealthCheckStatistics(BaseModel):
     """Health check statistics"""
     total_services: int
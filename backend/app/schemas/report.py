@@ -0,0 +1,29 @@
+"""Availability report schemas"""
+
+from typing import Optional, List
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class AvailabilityReportRow(BaseModel):
+    """Availability figures for one service, category or tag"""
+    id: Optional[int] = None
+    name: str
+    service_count: int
+    total_checks: int
+    uptime_percentage: Optional[float] = None
+    downtime_minutes: float
+    incident_count: int
+    mttr_minutes: Optional[float] = None
+    average_response_time: Optional[float] = None
+    latency_p50: Optional[float] = None
+    latency_p95: Optional[float] = None
+    latency_p99: Optional[float] = None
+
+
+class AvailabilityReport(BaseModel):
+    """Availability report over a time window"""
+    start: datetime
+    end: datetime
+    group_by: str
+    rows: List[AvailabilityReportRow] = []
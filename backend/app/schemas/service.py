@@ -1,6 +1,6 @@
 """Service schemas"""
 
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from pydantic import BaseModel, HttpUrl, Field, ConfigDict
 
@@ -33,6 +33,19 @@ class ServiceUpdate(BaseModel):
     tags: Optional[List[int]] = None
 
 
+class ServiceBulkCreateError(BaseModel):
+    """Why one item of a bulk create was rejected"""
+    index: int
+    detail: str
+
+
+class ServiceBulkCreateResult(BaseModel):
+    """Outcome of a bulk create, ``ids`` aligned with the submitted items"""
+    created: int
+    ids: List[Optional[int]] = []
+    errors: List[ServiceBulkCreateError] = []
+
+
 class ServiceBulkDelete(BaseModel):
     """Schema for bulk delete"""
     service_ids: List[int] = Field(..., min_length=1)
@@ -45,6 +58,27 @@ class ServiceBulkUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class ServiceFacets(BaseModel):
+    """Matching services per category, tag and status, leaving out zeros"""
+    total: int
+    categories: Dict[int, int] = {}  # Category ID -> count
+    uncategorized: int = 0
+    tags: Dict[int, int] = {}  # Tag ID -> count
+    statuses: Dict[str, int] = {}
+
+
+class ServiceDependencyUpdate(BaseModel):
+    """Schema for replacing a service's upstream dependencies"""
+    depends_on: List[int] = []
+
+
+class ServiceDependencies(BaseModel):
+    """Upstream and downstream dependencies of a service"""
+    service_id: int
+    depends_on: List[int] = []
+    dependents: List[int] = []
+
+
 class TagInService(BaseModel):
     """Tag info in service response"""
     id: int
@@ -87,7 +121,9 @@ class ServiceResponse(ServiceInDB):
 
 class ServiceListResponse(BaseModel):
     """Service list response with pagination"""
-    total: int
-    page: int
+    total: Optional[int] = None  # None when counting is skipped
+    page: Optional[int] = None  # None when paging by cursor
     size: int
-    items: List[ServiceResponse]
\ No newline at end of file
+    items: List[ServiceResponse]
+    has_more: bool = False
+    next_cursor: Optional[str] = None
\ No newline at end of file
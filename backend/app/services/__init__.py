@@ -5,6 +5,7 @@ from app.services.category import CategoryService
 from app.services.tag import TagService
 from app.services.health_check import HealthCheckService
 from app.services.config import ConfigService
+from app.services.report import ReportService
 
 __all__ = [
     "ServiceService",
@@ -12,4 +13,5 @@ __all__ = [
     "TagService",
     "HealthCheckService",
     "ConfigService",
+    "ReportService",
 ]
\ No newline at end of file
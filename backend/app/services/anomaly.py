@@ -0,0 +1,101 @@
+"""Online latency anomaly detection"""
+
+import asyncio
+import logging
+import math
+from typing import Awaitable, Callable, Dict, List, Optional
+from datetime import datetime
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyBaseline:
+    """Exponentially weighted mean and variance of one service's latency"""
+    
+    __slots__ = ("mean", "variance", "count")
+    
+    def __init__(self):
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+
+class LatencyAnomalyDetector:
+    """Flags response times far above a service's EWMA baseline
+    
+    Each observation updates the baseline in O(1) time and the detector
+    keeps one fixed-size baseline per service. Anomalies are published to
+    subscribers in background tasks, so a slow subscriber never holds up
+    the health check sweep.
+    """
+    
+    def __init__(
+        self,
+        alpha: float = settings.ANOMALY_EWMA_ALPHA,
+        threshold: float = settings.ANOMALY_Z_THRESHOLD,
+        warmup: int = settings.ANOMALY_WARMUP_CHECKS
+    ):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self._baselines: Dict[int, LatencyBaseline] = {}
+        self._subscribers: List[Callable[[Dict], Awaitable[None]]] = []
+        self._deliveries = set()
+    
+    def subscribe(self, callback: Callable[[Dict], Awaitable[None]]) -> None:
+        """Call ``callback`` with every published anomaly"""
+        self._subscribers.append(callback)
+    
+    def publish(self, anomaly: Dict) -> None:
+        """Hand an anomaly to every subscriber without waiting for them"""
+        for callback in self._subscribers:
+            task = asyncio.create_task(callback(anomaly))
+            self._deliveries.add(task)
+            task.add_done_callback(self._delivered)
+    
+    def _delivered(self, task: asyncio.Task) -> None:
+        self._deliveries.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Latency anomaly delivery failed: {task.exception()}")
+    
+    def observe(self, service_id: int, response_time: float) -> Optional[Dict]:
+        """Update the baseline and return an anomaly if the latency is unusual"""
+        baseline = self._baselines.get(service_id)
+        if baseline is None:
+            baseline = self._baselines[service_id] = LatencyBaseline()
+        
+        anomaly = None
+        if baseline.count == 0:
+            baseline.mean = response_time
+        else:
+            deviation = response_time - baseline.mean
+            std_dev = math.sqrt(baseline.variance)
+            if baseline.count >= self.warmup and std_dev > 0:
+                z_score = deviation / std_dev
+                if z_score > self.threshold:
+                    anomaly = {
+                        "service_id": service_id,
+                        "response_time": response_time,
+                        "baseline_mean": baseline.mean,
+                        "baseline_std_dev": std_dev,
+                        "z_score": z_score,
+                        "detected_at": datetime.utcnow().isoformat()
+                    }
+            
+            baseline.mean += self.alpha * deviation
+            baseline.variance = (1 - self.alpha) * (baseline.variance + self.alpha * deviation * deviation)
+        
+        baseline.count += 1
+        return anomaly
+    
+    def reset(self, service_id: int) -> None:
+        """Forget a service's baseline"""
+        self._baselines.pop(service_id, None)
+    
+    def clear(self) -> None:
+        self._baselines.clear()
+
+
+latency_detector = LatencyAnomalyDetector()
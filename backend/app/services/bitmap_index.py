@@ -0,0 +1,222 @@
+"""In-process bitmap index over service filter attributes
+
+Keeps one bitset of service IDs per tag, category, status and is_active
+value, so filter combinations resolve by AND-ing integers instead of
+querying ``service_tags``. Bitsets are plain, uncompressed Python ints with
+bit ``n`` set for service ``n``, sized by the highest ID in each; dense
+autoincrement IDs keep them small without a compressed representation.
+
+The index is rebuilt at startup and follows committed writes: services
+changed by row or named by a statement's ``changed_rows`` are re-read on
+the next lookup, while statements that cannot be attributed to services
+trigger a full rebuild. Tags and categories only hold services through
+``services`` and ``service_tags`` rows, so their own writes are ignored.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.core.data_version import data_versions, Changes
+from app.models.service import Service, service_tags
+
+
+class ServiceBitmapIndex:
+    """Bitsets of service IDs keyed by (attribute, value)"""
+    
+    # Tables whose writes move services between bitsets, keyed by service ID
+    WATCHED_TABLES = ("services", "service_tags")
+    
+    def __init__(self):
+        self._bitmaps: Dict[Tuple[str, object], int] = defaultdict(int)
+        self._all = 0
+        # Indexed (attribute, value) keys per service, to clear on refresh
+        self._keys: Dict[int, List[Tuple[str, object]]] = {}
+        self._stale = True
+        # Bumped whenever a commit marks the index stale, so a rebuild only
+        # clears the flag if nothing was marked while it was reading
+        self._stale_marks = 0
+        self._pending: Set[int] = set()
+        self._lock = asyncio.Lock()
+        data_versions.subscribe(self.on_commit)
+    
+    def on_commit(self, changes: Changes) -> None:
+        """Note services changed by a committed write"""
+        for table in self.WATCHED_TABLES:
+            if table not in changes:
+                continue
+            rows = changes[table]
+            if rows is not None:
+                self._pending.update(rows)
+            else:
+                self._stale = True
+                self._stale_marks += 1
+    
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Load every service into fresh bitsets"""
+        marks = self._stale_marks
+        # Writes committed while reading land in a fresh set for the next sync
+        pending, self._pending = self._pending, set()
+        try:
+            services = await db.execute(select(Service.id, Service.category_id, Service.status, Service.is_active))
+            links = await db.execute(select(service_tags.c.service_id, service_tags.c.tag_id))
+        except BaseException:
+            self._pending |= pending
+            raise
+        
+        tags = defaultdict(list)
+        for service_id, tag_id in links.all():
+            tags[service_id].append(tag_id)
+        
+        # Swapped in without awaiting, so lookups never see a partial index
+        self._bitmaps = defaultdict(int)
+        self._all = 0
+        self._keys = {}
+        for service_id, category_id, status, is_active in services.all():
+            self._add(service_id, category_id, status, is_active, tags.get(service_id, ()))
+        
+        if self._stale_marks == marks:
+            self._stale = False
+    
+    async def refresh(self, db: AsyncSession, service_ids: Set[int]) -> None:
+        """Re-read some services, dropping those that no longer exist"""
+        services = await db.execute(
+            select(Service.id, Service.category_id, Service.status, Service.is_active)
+            .filter(Service.id.in_(service_ids))
+        )
+        links = await db.execute(
+            select(service_tags.c.service_id, service_tags.c.tag_id)
+            .filter(service_tags.c.service_id.in_(service_ids))
+        )
+        
+        tags = defaultdict(list)
+        for service_id, tag_id in links.all():
+            tags[service_id].append(tag_id)
+        for service_id in service_ids:
+            self._remove(service_id)
+        for service_id, category_id, status, is_active in services.all():
+            self._add(service_id, category_id, status, is_active, tags.get(service_id, ()))
+    
+    async def sync(self, db: AsyncSession) -> None:
+        """Apply writes committed since the last lookup
+        
+        Syncs run one at a time and lookups wait for the one in progress.
+        Changes taken by a sync that fails are put back for the next one.
+        """
+        if not (self._stale or self._pending or self._lock.locked()):
+            return
+        async with self._lock:
+            if self._stale:
+                await self.rebuild(db)
+            elif self._pending:
+                pending, self._pending = self._pending, set()
+                try:
+                    await self.refresh(db, pending)
+                except BaseException:
+                    self._pending |= pending
+                    raise
+    
+    def _add(self, service_id: int, category_id, status, is_active, tag_ids) -> None:
+        bit = 1 << service_id
+        keys = [("category", category_id), ("status", status), ("is_active", bool(is_active))]
+        keys.extend(("tag", tag_id) for tag_id in tag_ids)
+        for key in keys:
+            self._bitmaps[key] |= bit
+        self._keys[service_id] = keys
+        self._all |= bit
+    
+    def _remove(self, service_id: int) -> None:
+        mask = ~(1 << service_id)
+        for key in self._keys.pop(service_id, ()):
+            self._bitmaps[key] &= mask
+        self._all &= mask
+    
+    async def match(
+        self,
+        db: AsyncSession,
+        *,
+        service_ids: Optional[List[int]] = None,
+        category_id: Optional[int] = None,
+        category_ids: Optional[List[int]] = None,
+        tag_ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> int:
+        """Bitset of services matching every given filter"""
+        await self.sync(db)
+        
+        bitmap = self._all
+        if service_ids:
+            bitmap &= self.bitmap_of(service_ids)
+        if category_id is not None:
+            bitmap &= self._bitmaps.get(("category", category_id), 0)
+        if category_ids:
+            selected = 0
+            for value in category_ids:
+                selected |= self._bitmaps.get(("category", value), 0)
+            bitmap &= selected
+        for tag_id in tag_ids or ():
+            bitmap &= self._bitmaps.get(("tag", tag_id), 0)
+        if status is not None:
+            bitmap &= self._bitmaps.get(("status", status), 0)
+        if is_active is not None:
+            bitmap &= self._bitmaps.get(("is_active", is_active), 0)
+        return bitmap
+    
+    async def lookup(
+        self,
+        db: AsyncSession,
+        *,
+        service_ids: Optional[List[int]] = None,
+        category_id: Optional[int] = None,
+        category_ids: Optional[List[int]] = None,
+        tag_ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Optional[List[int]]:
+        """IDs of services matching every given filter, or None if none was given"""
+        if not (service_ids or category_id is not None or category_ids or tag_ids
+                or status is not None or is_active is not None):
+            return None
+        
+        bitmap = await self.match(
+            db,
+            service_ids=service_ids,
+            category_id=category_id,
+            category_ids=category_ids,
+            tag_ids=tag_ids,
+            status=status,
+            is_active=is_active
+        )
+        return self.ids_of(bitmap)
+    
+    @staticmethod
+    def ids_of(bitmap: int) -> List[int]:
+        """IDs of the set bits, walking only those"""
+        ids = []
+        while bitmap:
+            lowest = bitmap & -bitmap
+            ids.append(lowest.bit_length() - 1)
+            bitmap ^= lowest
+        return ids
+    
+    @staticmethod
+    def bitmap_of(service_ids) -> int:
+        bitmap = 0
+        for service_id in service_ids:
+            bitmap |= 1 << service_id
+        return bitmap
+    
+    def counts(self, bitmap: int) -> Dict[str, Dict[object, int]]:
+        """Services of ``bitmap`` per attribute and value, leaving out zeros"""
+        counts = defaultdict(dict)
+        for (attribute, value), bits in self._bitmaps.items():
+            count = (bitmap & bits).bit_count()
+            if count:
+                counts[attribute][value] = count
+        return counts
+
+
+service_bitmap_index = ServiceBitmapIndex()
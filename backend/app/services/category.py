@@ -2,11 +2,12 @@
 
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, delete, case
 
+from app.core.cache import cache
 from app.models.category import Category
 from app.models.service import Service
+from app.services.anomaly import latency_detector
 from app.services.base import BaseService
 
 
@@ -16,50 +17,53 @@ class CategoryService(BaseService[Category]):
     def __init__(self):
         super().__init__(Category)
     
+    async def delete(self, db: AsyncSession, *, id: int) -> Optional[Category]:
+        """Delete a category and its services
+        
+        The services go in one DELETE statement, and their tags links and
+        health history with them through the database's ON DELETE rules.
+        """
+        category = await self.get(db, id)
+        if category:
+            result = await db.execute(
+                delete(Service)
+                .where(Service.category_id == id)
+                .returning(Service.id)
+                .execution_options(synchronize_session=False)
+            )
+            service_ids = result.scalars().all()
+            await db.delete(category)
+            await db.commit()
+            for service_id in service_ids:
+                latency_detector.reset(service_id)
+        return category
+    
+    @staticmethod
+    def to_dict(category: Category) -> dict:
+        """Plain column values of a category, so it can be cached"""
+        return {column.key: getattr(category, column.key) for column in Category.__table__.columns}
+    
     async def get_with_service_count(
         self,
         db: AsyncSession,
         id: int
     ) -> Optional[dict]:
-        """Get category with service count"""
+        """Get category with its maintained service count"""
         category = await self.get(db, id)
-        if not category:
-            return None
-        
-        # Count services
-        count_result = await db.execute(
-            select(func.count(Service.id))
-            .filter(Service.category_id == id)
-        )
-        service_count = count_result.scalar_one()
-        
-        return {
-            **category.__dict__,
-            "service_count": service_count
-        }
+        return self.to_dict(category) if category else None
     
     async def get_all_with_service_count(
         self,
         db: AsyncSession
     ) -> List[dict]:
-        """Get all categories with service counts"""
-        # Get categories with services loaded
-        result = await db.execute(
-            select(Category)
-            .options(selectinload(Category.services))
-            .order_by(Category.sort_order, Category.name)
-        )
-        categories = result.scalars().all()
-        
-        # Build response with counts
-        response = []
-        for category in categories:
-            response.append({
-                **category.__dict__,
-                "service_count": len(category.services)
-            })
+        """Get all categories with their maintained service counts, cached until categories change"""
+        async def load() -> List[dict]:
+            result = await db.execute(
+                select(Category).order_by(Category.sort_order, Category.name)
+            )
+            return [self.to_dict(category) for category in result.scalars().all()]
         
-        return response
+        return await cache.get_or_load("categories:all", ("categories",), load)
     
     async def get_by_name(
         self,
@@ -76,24 +80,31 @@ class CategoryService(BaseService[Category]):
         self,
         db: AsyncSession,
         category_orders: List[dict]
-    ) -> List[Category]:
-        """Reorder categories"""
-        updated_categories = []
+    ) -> List[dict]:
+        """Reorder categories with one UPDATE ... CASE statement
         
-        for order_item in category_orders:
-            category = await self.get(db, order_item["id"])
-            if category:
-                category.sort_order = order_item["sort_order"]
-                db.add(category)
-                updated_categories.append(category)
+        Every ID must exist and appear once, otherwise nothing changes.
+        Returns all categories in the new order with their service counts.
+        """
+        sort_orders = {item["id"]: item["sort_order"] for item in category_orders}
+        if len(sort_orders) != len(category_orders):
+            raise ValueError("Duplicate category IDs")
         
-        await db.commit()
+        if sort_orders:
+            result = await db.execute(
+                update(Category)
+                .where(Category.id.in_(sort_orders))
+                .values(sort_order=case(sort_orders, value=Category.id))
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != len(sort_orders):
+                await db.rollback()
+                existing = await db.execute(select(Category.id).filter(Category.id.in_(sort_orders)))
+                missing = set(sort_orders) - set(existing.scalars().all())
+                raise ValueError(f"Categories not found: {sorted(missing)}")
+            await db.commit()
         
-        # Return all categories in new order
-        result = await db.execute(
-            select(Category).order_by(Category.sort_order, Category.name)
-        )
-        return result.scalars().all()
+        return await self.get_all_with_service_count(db)
 
 
 category_service = CategoryService()
\ No newline at end of file
@@ -4,12 +4,13 @@ import json
 from typing import Dict, List, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete
 
 from app.models.config import ConfigVersion
 from app.models.service import Service, ServiceTag
 from app.models.category import Category
 from app.schemas.config import ConfigExport, ConfigImport
+from app.services.anomaly import latency_detector
 from app.services.base import BaseService
 from app.services.service import service_service
 from app.services.category import category_service
@@ -121,10 +122,11 @@ class ConfigService(BaseService[ConfigVersion]):
         # Handle merge mode
         if config.merge_mode == "replace":
             # Delete all existing data
-            await db.execute(select(Service).delete())
-            await db.execute(select(Category).delete())
-            await db.execute(select(ServiceTag).delete())
+            await db.execute(delete(Service))
+            await db.execute(delete(Category))
+            await db.execute(delete(ServiceTag))
             await db.commit()
+            latency_detector.clear()
         
         # Import categories
         category_map = {}  # Map old names to new IDs
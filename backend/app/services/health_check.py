@@ -2,24 +2,69 @@
 
 import asyncio
 import time
-from typing import List, Optional, Dict
+from collections import defaultdict
+from typing import List, Optional, Dict, AsyncIterator, Tuple
 from datetime import datetime, timedelta
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import event, select, update, func, and_, desc, case
+from sqlalchemy.orm import Session
 
 from app.models.service import Service
-from app.models.health_check import HealthCheckRecord
+from app.models.health_check import (
+    HealthCheckRecord,
+    HealthCheckError,
+    HealthCheckRollup,
+    HealthStatus,
+    ServiceIncident,
+    LATENCY_BUCKET_COLUMNS,
+    HOUR_MS,
+    DAY_MS,
+    bucket_start_expression,
+    latency_bucket_column,
+    latency_bucket_counts,
+    now_epoch_ms,
+    to_epoch_ms,
+)
 from app.services.base import BaseService
+from app.services.service import service_service
+from app.services.anomaly import latency_detector
+from app.services.report import AvailabilityTotals
+from app.core.cache import cache
 from app.core.config import settings
+from app.core.database import dialect_insert
+from app.core.pagination import encode_cursor, decode_cursor, keyset_filter
 
 
 class HealthCheckService(BaseService[HealthCheckRecord]):
     """Health check service for monitoring service availability"""
     
+    # Columns of a health check record response, error joined in
+    RECORD_COLUMNS = (
+        HealthCheckRecord.id,
+        HealthCheckRecord.service_id,
+        HealthCheckRecord.checked_at,
+        HealthCheckRecord.status,
+        HealthCheckRecord.status_code,
+        HealthCheckRecord.response_time,
+        HealthCheckError.message,
+    )
+    
+    HISTORY_BUCKETS = {
+        "1m": 60 * 1000,
+        "5m": 5 * 60 * 1000,
+        "1h": HOUR_MS,
+        "1d": DAY_MS,
+    }
+    
     def __init__(self):
         super().__init__(HealthCheckRecord)
         self.timeout = settings.HEALTH_CHECK_TIMEOUT
+        self._semaphore = asyncio.Semaphore(settings.HEALTH_CHECK_CONCURRENCY)
+        # Message -> ID of committed error rows, shared by all sessions
+        self._error_ids: Dict[str, int] = {}
+        event.listen(Session, "after_commit", self._cache_interned_errors)
+        event.listen(Session, "after_rollback", self._discard_interned_errors)
     
     async def check_service_health(
         self,
@@ -65,6 +110,294 @@ class HealthCheckService(BaseService[HealthCheckRecord]):
             "error_message": error_message
         }
     
+    @staticmethod
+    def dependency_levels(
+        service_ids: List[int],
+        dependency_map: Dict[int, List[int]]
+    ) -> List[List[int]]:
+        """Group services into topological levels, upstream services first"""
+        selected = set(service_ids)
+        remaining = {
+            service_id: {dep for dep in dependency_map.get(service_id, []) if dep in selected}
+            for service_id in service_ids
+        }
+        
+        levels = []
+        while remaining:
+            level = sorted(service_id for service_id, deps in remaining.items() if not deps)
+            if not level:
+                # Cycle in the graph: probe whatever is left without ordering
+                level = sorted(remaining)
+            for service_id in level:
+                del remaining[service_id]
+            for deps in remaining.values():
+                deps.difference_update(level)
+            levels.append(level)
+        
+        return levels
+    
+    async def check_services(
+        self,
+        db: AsyncSession,
+        services: List[Service]
+    ) -> AsyncIterator[Dict]:
+        """Check services concurrently in dependency order, yielding each result as it completes
+        
+        Services whose upstream is down are marked "upstream_down" without
+        being probed. Dependents held back that way are re-probed together
+        with their upstream so they recover as soon as it does.
+        """
+        async def limited_check(service: Service) -> Dict:
+            async with self._semaphore:
+                return await self.check_service_health(service)
+        
+        dependency_map = await service_service.get_dependency_map(db)
+        services = list(services)
+        services_by_id = {service.id: service for service in services}
+        
+        # Pull in dependents held back by an upstream in this selection
+        dependents_map = {}
+        for service_id, upstream_ids in dependency_map.items():
+            for upstream_id in upstream_ids:
+                dependents_map.setdefault(upstream_id, []).append(service_id)
+        stack = list(services_by_id)
+        reachable = set()
+        while stack:
+            for dependent_id in dependents_map.get(stack.pop(), []):
+                if dependent_id not in reachable and dependent_id not in services_by_id:
+                    reachable.add(dependent_id)
+                    stack.append(dependent_id)
+        if reachable:
+            held_result = await db.execute(
+                select(Service).filter(
+                    Service.id.in_(reachable),
+                    Service.status == "upstream_down",
+                    Service.is_active == True
+                )
+            )
+            for service in held_result.scalars().all():
+                services.append(service)
+                services_by_id[service.id] = service
+        
+        # Upstreams outside the selection count as down from their stored status
+        down = {}
+        external_ids = {
+            upstream_id
+            for service_id in services_by_id
+            for upstream_id in dependency_map.get(service_id, [])
+            if upstream_id not in services_by_id
+        }
+        if external_ids:
+            status_result = await db.execute(
+                select(Service.id, Service.status).filter(Service.id.in_(external_ids))
+            )
+            down = {
+                service_id: status in ("inactive", "upstream_down")
+                for service_id, status in status_result.all()
+            }
+        
+        for level in self.dependency_levels(list(services_by_id), dependency_map):
+            to_probe = []
+            for service_id in level:
+                failed_upstream = next(
+                    (dep for dep in dependency_map.get(service_id, []) if down.get(dep)),
+                    None
+                )
+                if failed_upstream is None:
+                    to_probe.append(services_by_id[service_id])
+                    continue
+                
+                check_result = {
+                    "service_id": service_id,
+                    "status_code": None,
+                    "response_time": None,
+                    "is_healthy": "upstream_down",
+                    "error_message": f"Upstream service {failed_upstream} is down"
+                }
+                await self.save_check_result(db, services_by_id[service_id], check_result)
+                down[service_id] = True
+                yield check_result
+            
+            tasks = [asyncio.ensure_future(limited_check(service)) for service in to_probe]
+            try:
+                for next_result in asyncio.as_completed(tasks):
+                    check_result = await next_result
+                    await self.save_check_result(db, services_by_id[check_result["service_id"]], check_result)
+                    down[check_result["service_id"]] = check_result["is_healthy"] != "healthy"
+                    
+                    if check_result["is_healthy"] == "healthy":
+                        anomaly = latency_detector.observe(
+                            check_result["service_id"], check_result["response_time"]
+                        )
+                        if anomaly:
+                            anomaly["service_name"] = services_by_id[check_result["service_id"]].name
+                            latency_detector.publish(anomaly)
+                    
+                    yield check_result
+            finally:
+                # Stop outstanding probes if the consumer goes away
+                for task in tasks:
+                    task.cancel()
+        
+        await db.commit()
+    
+    async def save_check_result(
+        self,
+        db: AsyncSession,
+        service: Service,
+        check_result: Dict
+    ) -> None:
+        """Record a check result and update the service status"""
+        was_down = service.status in ("inactive", "upstream_down")
+        
+        if check_result["is_healthy"] == "upstream_down":
+            # Not probed, so nothing to record in the history
+            if not was_down:
+                db.add(ServiceIncident(service_id=service.id, started_at=now_epoch_ms()))
+            service.status = "upstream_down"
+            db.add(service)
+            return
+        
+        record = await self.create_record(db, check_result)
+        
+        is_down = check_result["is_healthy"] != "healthy"
+        if is_down and not was_down:
+            db.add(ServiceIncident(service_id=service.id, started_at=record.checked_at))
+        elif was_down and not is_down:
+            await db.execute(
+                update(ServiceIncident)
+                .where(
+                    ServiceIncident.service_id == service.id,
+                    ServiceIncident.resolved_at.is_(None)
+                )
+                .values(resolved_at=record.checked_at)
+            )
+        
+        service.status = "active" if check_result["is_healthy"] == "healthy" else "inactive"
+        service.last_check_time = check_result["response_time"]
+        service.last_check_status = check_result["status_code"]
+        
+        # Calculate uptime percentage (last 24 hours)
+        uptime = await self.calculate_uptime(db, service.id, hours=24)
+        service.uptime_percentage = uptime
+        
+        db.add(service)
+    
+    async def intern_error(
+        self,
+        db: AsyncSession,
+        message: Optional[str]
+    ) -> Optional[int]:
+        """Get the ID of an error message, storing it once if new"""
+        if message is None:
+            return None
+        message = message[:HealthCheckError.MAX_LENGTH]
+        
+        # IDs seen in this transaction may be uncommitted, so they stay with
+        # the session and join the shared cache only once it commits
+        interned = db.info.setdefault("interned_errors", {})
+        error_id = self._error_ids.get(message) or interned.get(message)
+        if error_id is not None:
+            return error_id
+        
+        result = await db.execute(
+            select(HealthCheckError.id).filter(HealthCheckError.message == message)
+        )
+        error_id = result.scalar_one_or_none()
+        if error_id is None:
+            await db.execute(
+                dialect_insert(db)(HealthCheckError)
+                .values(message=message)
+                .on_conflict_do_nothing(index_elements=["message"])
+            )
+            result = await db.execute(
+                select(HealthCheckError.id).filter(HealthCheckError.message == message)
+            )
+            error_id = result.scalar_one()
+        interned[message] = error_id
+        return error_id
+    
+    def _cache_interned_errors(self, session: Session) -> None:
+        interned = session.info.pop("interned_errors", None)
+        if interned:
+            self._error_ids.update(interned)
+    
+    def _discard_interned_errors(self, session: Session) -> None:
+        session.info.pop("interned_errors", None)
+    
+    async def create_record(
+        self,
+        db: AsyncSession,
+        check_result: Dict
+    ) -> HealthCheckRecord:
+        """Add a compact health check record for a check result"""
+        record = HealthCheckRecord(
+            service_id=check_result["service_id"],
+            checked_at=now_epoch_ms(),
+            status=HealthStatus.from_label(check_result["is_healthy"]),
+            status_code=check_result["status_code"],
+            response_time=check_result["response_time"],
+            error_id=await self.intern_error(db, check_result["error_message"])
+        )
+        db.add(record)
+        await self.update_rollups(db, record)
+        return record
+    
+    async def update_rollups(
+        self,
+        db: AsyncSession,
+        record: HealthCheckRecord
+    ) -> None:
+        """Fold a record into its hourly and daily rollups"""
+        rollups = HealthCheckRollup.__table__.c
+        healthy = record.status == HealthStatus.HEALTHY
+        latency = record.response_time if healthy else None
+        
+        values = {
+            "service_id": record.service_id,
+            "total_checks": 1,
+            "healthy_checks": int(healthy),
+            "latency_count": 0,
+            "latency_sum": 0.0,
+        }
+        increments = {
+            "total_checks": rollups.total_checks + 1,
+            "healthy_checks": rollups.healthy_checks + int(healthy),
+        }
+        if latency is not None:
+            bucket_column = latency_bucket_column(latency)
+            values.update({
+                "latency_count": 1,
+                "latency_sum": latency,
+                "latency_min": latency,
+                "latency_max": latency,
+                bucket_column: 1,
+            })
+            increments.update({
+                "latency_count": rollups.latency_count + 1,
+                "latency_sum": rollups.latency_sum + latency,
+                "latency_min": func.coalesce(func.min(rollups.latency_min, latency), latency),
+                "latency_max": func.coalesce(func.max(rollups.latency_max, latency), latency),
+                bucket_column: rollups[bucket_column] + 1,
+            })
+            if db.bind.dialect.name == "postgresql":
+                increments["latency_min"] = func.least(rollups.latency_min, latency)
+                increments["latency_max"] = func.greatest(rollups.latency_max, latency)
+        
+        for resolution in HealthCheckRollup.RESOLUTIONS:
+            await db.execute(
+                dialect_insert(db)(HealthCheckRollup)
+                .values(
+                    resolution=resolution,
+                    bucket_start=record.checked_at - record.checked_at % resolution,
+                    **values
+                )
+                .on_conflict_do_update(
+                    index_elements=["resolution", "bucket_start", "service_id"],
+                    set_=increments
+                )
+            )
+    
     async def check_all_services(
         self,
         db: AsyncSession
@@ -76,31 +409,7 @@ class HealthCheckService(BaseService[HealthCheckRecord]):
         )
         services = result.scalars().all()
         
-        # Check each service concurrently
-        tasks = [self.check_service_health(service) for service in services]
-        results = await asyncio.gather(*tasks)
-        
-        # Save results to database
-        for check_result in results:
-            record = HealthCheckRecord(**check_result)
-            db.add(record)
-            
-            # Update service status
-            service = next((s for s in services if s.id == check_result["service_id"]), None)
-            if service:
-                service.status = "active" if check_result["is_healthy"] == "healthy" else "inactive"
-                service.last_check_time = check_result["response_time"]
-                service.last_check_status = check_result["status_code"]
-                
-                # Calculate uptime percentage (last 24 hours)
-                uptime = await self.calculate_uptime(db, service.id, hours=24)
-                service.uptime_percentage = uptime
-                
-                db.add(service)
-        
-        await db.commit()
-        
-        return results
+        return [check_result async for check_result in self.check_services(db, services)]
     
     async def calculate_uptime(
         self,
@@ -109,7 +418,7 @@ class HealthCheckService(BaseService[HealthCheckRecord]):
         hours: int = 24
     ) -> float:
         """Calculate service uptime percentage for given period"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        cutoff_time = to_epoch_ms(datetime.utcnow() - timedelta(hours=hours))
         
         # Get total checks
         total_result = await db.execute(
@@ -117,7 +426,7 @@ class HealthCheckService(BaseService[HealthCheckRecord]):
             .filter(
                 and_(
                     HealthCheckRecord.service_id == service_id,
-                    HealthCheckRecord.created_at >= cutoff_time
+                    HealthCheckRecord.checked_at >= cutoff_time
                 )
             )
         )
@@ -132,8 +441,8 @@ class HealthCheckService(BaseService[HealthCheckRecord]):
             .filter(
                 and_(
                     HealthCheckRecord.service_id == service_id,
-                    HealthCheckRecord.created_at >= cutoff_time,
-                    HealthCheckRecord.is_healthy == "healthy"
+                    HealthCheckRecord.checked_at >= cutoff_time,
+                    HealthCheckRecord.status == HealthStatus.HEALTHY
                 )
             )
         )
@@ -145,29 +454,199 @@ class HealthCheckService(BaseService[HealthCheckRecord]):
         self,
         db: AsyncSession,
         service_id: int,
-        hours: int = 24
+        hours: int = 24,
+        limit: Optional[int] = None
     ) -> List[HealthCheckRecord]:
-        """Get health check history for a service"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        """Get health check history for a service, newest first"""
+        cutoff_time = to_epoch_ms(datetime.utcnow() - timedelta(hours=hours))
         
-        result = await db.execute(
+        query = (
             select(HealthCheckRecord)
             .filter(
                 and_(
                     HealthCheckRecord.service_id == service_id,
-                    HealthCheckRecord.created_at >= cutoff_time
+                    HealthCheckRecord.checked_at >= cutoff_time
                 )
             )
-            .order_by(desc(HealthCheckRecord.created_at))
+            .order_by(desc(HealthCheckRecord.checked_at))
         )
+        if limit is not None:
+            query = query.limit(limit)
         
+        result = await db.execute(query)
         return result.scalars().all()
     
+    async def get_history_page(
+        self,
+        db: AsyncSession,
+        service_id: int,
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        hours: Optional[int] = None
+    ) -> Tuple[List[HealthCheckRecord], Optional[str]]:
+        """Get one page of health check history, newest first, keyed on (checked_at, id)"""
+        query = select(HealthCheckRecord).filter(HealthCheckRecord.service_id == service_id)
+        keys = [
+            (HealthCheckRecord.checked_at, True),
+            (HealthCheckRecord.id, True),
+        ]
+        
+        if hours is not None:
+            cutoff_time = to_epoch_ms(datetime.utcnow() - timedelta(hours=hours))
+            query = query.filter(HealthCheckRecord.checked_at >= cutoff_time)
+        
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(keys) or not all(isinstance(value, int) for value in values):
+                raise ValueError("Invalid cursor")
+            query = query.filter(keyset_filter(keys, values))
+        
+        result = await db.execute(
+            query
+            .order_by(*[column.desc() if descending else column for column, descending in keys])
+            .limit(limit + 1)
+        )
+        records = result.scalars().all()
+        
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            next_cursor = encode_cursor([records[-1].checked_at, records[-1].id])
+        
+        return records, next_cursor
+    
+    async def stream_history(
+        self,
+        db: AsyncSession,
+        service_id: int,
+        hours: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """Stream health check history rows, newest first, through a server-side cursor"""
+        query = (
+            select(*self.RECORD_COLUMNS)
+            .outerjoin(HealthCheckError, HealthCheckRecord.error_id == HealthCheckError.id)
+            .filter(HealthCheckRecord.service_id == service_id)
+            .order_by(desc(HealthCheckRecord.checked_at), desc(HealthCheckRecord.id))
+            .execution_options(yield_per=1000)
+        )
+        if hours is not None:
+            cutoff_time = to_epoch_ms(datetime.utcnow() - timedelta(hours=hours))
+            query = query.filter(HealthCheckRecord.checked_at >= cutoff_time)
+        
+        result = await db.stream(query)
+        async for row in result:
+            yield self.record_row(row)
+    
+    @staticmethod
+    def record_row(row) -> Dict:
+        """Plain HealthCheckRecordResponse dict from a row of RECORD_COLUMNS"""
+        return {
+            "id": row.id,
+            "service_id": row.service_id,
+            "created_at": datetime.utcfromtimestamp(row.checked_at / 1000).isoformat(),
+            "is_healthy": HealthStatus(row.status).label,
+            "status_code": row.status_code,
+            "response_time": row.response_time,
+            "error_message": row.message
+        }
+    
+    async def get_bucketed_history(
+        self,
+        db: AsyncSession,
+        service_ids: List[int],
+        hours: int = 24,
+        bucket: str = "1h"
+    ) -> Dict[int, List[Dict]]:
+        """Get health history aggregated into time buckets, per service
+        
+        Hourly and daily buckets are read from rollups; finer buckets are
+        grouped in the database from the raw records.
+        """
+        bucket_ms = self.HISTORY_BUCKETS[bucket]
+        cutoff_time = to_epoch_ms(datetime.utcnow() - timedelta(hours=hours))
+        
+        if bucket_ms in HealthCheckRollup.RESOLUTIONS:
+            rollup = HealthCheckRollup
+            query = (
+                select(
+                    rollup.service_id,
+                    rollup.bucket_start,
+                    rollup.total_checks,
+                    rollup.healthy_checks,
+                    rollup.latency_count,
+                    rollup.latency_sum,
+                    rollup.latency_min,
+                    rollup.latency_max,
+                    *[getattr(rollup, column) for column in LATENCY_BUCKET_COLUMNS]
+                )
+                .filter(
+                    rollup.resolution == bucket_ms,
+                    rollup.service_id.in_(service_ids),
+                    rollup.bucket_start >= cutoff_time - cutoff_time % bucket_ms
+                )
+                .order_by(rollup.service_id, rollup.bucket_start)
+            )
+        else:
+            bucket_start = bucket_start_expression(HealthCheckRecord.checked_at, bucket_ms)
+            healthy = HealthCheckRecord.status == HealthStatus.HEALTHY
+            latency = case((healthy, HealthCheckRecord.response_time))
+            query = (
+                select(
+                    HealthCheckRecord.service_id,
+                    bucket_start,
+                    func.count(),
+                    func.sum(case((healthy, 1), else_=0)),
+                    func.count(latency),
+                    func.coalesce(func.sum(latency), 0.0),
+                    func.min(latency),
+                    func.max(latency),
+                    *latency_bucket_counts(healthy, HealthCheckRecord.response_time)
+                )
+                .filter(
+                    HealthCheckRecord.service_id.in_(service_ids),
+                    HealthCheckRecord.checked_at >= cutoff_time
+                )
+                .group_by(HealthCheckRecord.service_id, bucket_start)
+                .order_by(HealthCheckRecord.service_id, bucket_start)
+            )
+        
+        result = await db.execute(query)
+        
+        history = {service_id: [] for service_id in service_ids}
+        for row in result.all():
+            totals = AvailabilityTotals()
+            totals.latency_count = row[4]
+            totals.latency_min = row[6]
+            totals.latency_max = row[7]
+            totals.histogram = list(row[8:])
+            
+            history[row[0]].append({
+                "timestamp": datetime.utcfromtimestamp(row[1] / 1000),
+                "count": row[2],
+                "healthy_ratio": row[3] / row[2] if row[2] else 0.0,
+                "min_response_time": row[6],
+                "avg_response_time": row[5] / row[4] if row[4] else None,
+                "max_response_time": row[7],
+                "p95_response_time": totals.percentile(0.95)
+            })
+        
+        return history
+    
     async def get_health_statistics(
         self,
         db: AsyncSession
     ) -> Dict:
-        """Get overall health statistics"""
+        """Get overall health statistics, cached until health data changes"""
+        return await cache.get_or_load(
+            "health:statistics", ("health",), lambda: self.compute_health_statistics(db)
+        )
+    
+    async def compute_health_statistics(
+        self,
+        db: AsyncSession
+    ) -> Dict:
+        """Get overall health statistics as plain dicts, ready to encode"""
         # Get service counts by status
         result = await db.execute(
             select(
@@ -187,18 +666,41 @@ class HealthCheckService(BaseService[HealthCheckRecord]):
         
         # Get services with their latest health status
         services_result = await db.execute(
-            select(Service)
+            select(
+                Service.id,
+                Service.name,
+                Service.url,
+                Service.status,
+                Service.last_check_time,
+                Service.last_check_status,
+                Service.uptime_percentage
+            )
             .filter(Service.is_active == True)
             .order_by(Service.sort_order)
         )
-        services = services_result.scalars().all()
+        services = services_result.all()
         
-        service_statuses = []
-        for service in services:
-            # Get recent checks
-            recent_checks = await self.get_service_health_history(db, service.id, hours=1)
-            
-            service_statuses.append({
+        # Last 5 checks of the past hour per service, in one windowed query
+        cutoff_time = to_epoch_ms(datetime.utcnow() - timedelta(hours=1))
+        position = func.row_number().over(
+            partition_by=HealthCheckRecord.service_id,
+            order_by=(desc(HealthCheckRecord.checked_at), desc(HealthCheckRecord.id))
+        )
+        recent = (
+            select(*self.RECORD_COLUMNS, position.label("position"))
+            .outerjoin(HealthCheckError, HealthCheckRecord.error_id == HealthCheckError.id)
+            .filter(HealthCheckRecord.checked_at >= cutoff_time)
+            .subquery()
+        )
+        recent_result = await db.execute(
+            select(recent).filter(recent.c.position <= 5).order_by(recent.c.service_id, recent.c.position)
+        )
+        recent_checks = defaultdict(list)
+        for row in recent_result.all():
+            recent_checks[row.service_id].append(self.record_row(row))
+        
+        service_statuses = [
+            {
                 "service_id": service.id,
                 "service_name": service.name,
                 "url": service.url,
@@ -206,15 +708,17 @@ class HealthCheckService(BaseService[HealthCheckRecord]):
                 "last_check_time": service.last_check_time,
                 "last_check_status": service.last_check_status,
                 "uptime_percentage": service.uptime_percentage or 100.0,
-                "recent_checks": recent_checks[:5]  # Last 5 checks
-            })
+                "recent_checks": recent_checks.get(service.id, [])
+            }
+            for service in services
+        ]
         
         return {
             "total_services": len(services),
             "healthy_services": status_counts.get("active", 0),
-            "unhealthy_services": status_counts.get("inactive", 0),
+            "unhealthy_services": status_counts.get("inactive", 0) + status_counts.get("upstream_down", 0),
             "unknown_services": status_counts.get("unknown", 0),
-            "average_response_time": avg_response_time,
+            "average_response_time": float(avg_response_time),
             "services": service_statuses
         }
     
@@ -224,11 +728,11 @@ class HealthCheckService(BaseService[HealthCheckRecord]):
         days: int = 30
     ):
         """Clean up old health check records"""
-        cutoff_time = datetime.utcnow() - timedelta(days=days)
+        cutoff_time = to_epoch_ms(datetime.utcnow() - timedelta(days=days))
         
         result = await db.execute(
             select(HealthCheckRecord)
-            .filter(HealthCheckRecord.created_at < cutoff_time)
+            .filter(HealthCheckRecord.checked_at < cutoff_time)
         )
         old_records = result.scalars().all()
         
@@ -0,0 +1,254 @@
+"""Availability reporting from health check rollups"""
+
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, or_
+
+from app.models.service import Service, ServiceTag, service_tags
+from app.models.category import Category
+from app.models.health_check import (
+    HealthCheckRollup,
+    ServiceIncident,
+    LATENCY_BUCKET_BOUNDS,
+    LATENCY_BUCKET_COLUMNS,
+    HOUR_MS,
+    DAY_MS,
+    now_epoch_ms,
+    to_epoch_ms,
+)
+from app.services.base import BaseService
+
+
+class AvailabilityTotals:
+    """Summable availability counters for a service or a group of services"""
+    
+    __slots__ = (
+        "total_checks", "healthy_checks", "latency_count", "latency_sum",
+        "latency_min", "latency_max", "histogram", "downtime_ms",
+        "incident_count", "repaired_count", "repair_ms",
+    )
+    
+    def __init__(self):
+        self.total_checks = 0
+        self.healthy_checks = 0
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.latency_min = None
+        self.latency_max = None
+        self.histogram = [0] * len(LATENCY_BUCKET_COLUMNS)
+        self.downtime_ms = 0
+        self.incident_count = 0
+        self.repaired_count = 0
+        self.repair_ms = 0
+    
+    def merge(self, other: "AvailabilityTotals") -> None:
+        """Add another set of counters to this one"""
+        self.total_checks += other.total_checks
+        self.healthy_checks += other.healthy_checks
+        self.latency_count += other.latency_count
+        self.latency_sum += other.latency_sum
+        if other.latency_min is not None:
+            self.latency_min = other.latency_min if self.latency_min is None else min(self.latency_min, other.latency_min)
+        if other.latency_max is not None:
+            self.latency_max = other.latency_max if self.latency_max is None else max(self.latency_max, other.latency_max)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        self.downtime_ms += other.downtime_ms
+        self.incident_count += other.incident_count
+        self.repaired_count += other.repaired_count
+        self.repair_ms += other.repair_ms
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate a latency percentile by interpolating within the histogram"""
+        if not self.latency_count:
+            return None
+        
+        rank = q * self.latency_count
+        cumulative = 0
+        lower = 0.0
+        for bound, bucket_count in zip(LATENCY_BUCKET_BOUNDS + (self.latency_max,), self.histogram):
+            if bucket_count and cumulative + bucket_count >= rank:
+                value = lower + (bound - lower) * (rank - cumulative) / bucket_count
+                return min(max(value, self.latency_min), self.latency_max)
+            cumulative += bucket_count
+            lower = bound
+        return self.latency_max
+
+
+class ReportService(BaseService[HealthCheckRollup]):
+    """Availability reports over arbitrary windows"""
+    
+    def __init__(self):
+        super().__init__(HealthCheckRollup)
+    
+    @staticmethod
+    def align_window(start: datetime, end: datetime) -> Tuple[int, int]:
+        """Widen a window to whole hours, the finest rollup resolution"""
+        start_ms = to_epoch_ms(start)
+        end_ms = to_epoch_ms(end)
+        return start_ms - start_ms % HOUR_MS, -(-end_ms // HOUR_MS) * HOUR_MS
+    
+    async def get_service_totals(
+        self,
+        db: AsyncSession,
+        start_ms: int,
+        end_ms: int
+    ) -> Dict[int, AvailabilityTotals]:
+        """Aggregate rollups and incidents per service over an hour-aligned window"""
+        rollup = HealthCheckRollup
+        
+        # Whole days come from daily rollups, the ragged edges from hourly ones
+        day_start = -(-start_ms // DAY_MS) * DAY_MS
+        day_end = end_ms - end_ms % DAY_MS
+        if day_start < day_end:
+            window = or_(
+                and_(
+                    rollup.resolution == DAY_MS,
+                    rollup.bucket_start >= day_start,
+                    rollup.bucket_start < day_end
+                ),
+                and_(
+                    rollup.resolution == HOUR_MS,
+                    or_(
+                        and_(rollup.bucket_start >= start_ms, rollup.bucket_start < day_start),
+                        and_(rollup.bucket_start >= day_end, rollup.bucket_start < end_ms)
+                    )
+                )
+            )
+        else:
+            window = and_(
+                rollup.resolution == HOUR_MS,
+                rollup.bucket_start >= start_ms,
+                rollup.bucket_start < end_ms
+            )
+        
+        result = await db.execute(
+            select(
+                rollup.service_id,
+                func.sum(rollup.total_checks),
+                func.sum(rollup.healthy_checks),
+                func.sum(rollup.latency_count),
+                func.sum(rollup.latency_sum),
+                func.min(rollup.latency_min),
+                func.max(rollup.latency_max),
+                *[func.sum(getattr(rollup, column)) for column in LATENCY_BUCKET_COLUMNS]
+            )
+            .filter(window)
+            .group_by(rollup.service_id)
+        )
+        
+        totals: Dict[int, AvailabilityTotals] = {}
+        for row in result.all():
+            service_totals = totals[row[0]] = AvailabilityTotals()
+            service_totals.total_checks = row[1] or 0
+            service_totals.healthy_checks = row[2] or 0
+            service_totals.latency_count = row[3] or 0
+            service_totals.latency_sum = row[4] or 0.0
+            service_totals.latency_min = row[5]
+            service_totals.latency_max = row[6]
+            service_totals.histogram = [count or 0 for count in row[7:]]
+        
+        incidents = await db.execute(
+            select(ServiceIncident.service_id, ServiceIncident.started_at, ServiceIncident.resolved_at)
+            .filter(
+                ServiceIncident.started_at < end_ms,
+                or_(ServiceIncident.resolved_at.is_(None), ServiceIncident.resolved_at > start_ms)
+            )
+        )
+        now = now_epoch_ms()
+        for service_id, started_at, resolved_at in incidents.all():
+            service_totals = totals.setdefault(service_id, AvailabilityTotals())
+            stopped_at = resolved_at if resolved_at is not None else now
+            service_totals.downtime_ms += max(min(stopped_at, end_ms) - max(started_at, start_ms), 0)
+            if started_at >= start_ms:
+                service_totals.incident_count += 1
+                if resolved_at is not None:
+                    service_totals.repaired_count += 1
+                    service_totals.repair_ms += resolved_at - started_at
+        
+        return totals
+    
+    async def get_groups(
+        self,
+        db: AsyncSession,
+        group_by: str
+    ) -> List[Tuple[Optional[int], str, List[int]]]:
+        """Get (id, name, service IDs) for each report group"""
+        services_result = await db.execute(
+            select(Service.id, Service.name, Service.category_id).order_by(Service.name)
+        )
+        services = services_result.all()
+        
+        if group_by == "service":
+            return [(service_id, name, [service_id]) for service_id, name, _ in services]
+        
+        if group_by == "category":
+            categories_result = await db.execute(
+                select(Category.id, Category.name).order_by(Category.sort_order, Category.name)
+            )
+            names = dict(categories_result.all())
+            members = {category_id: [] for category_id in names}
+            for service_id, _, category_id in services:
+                members.setdefault(category_id, []).append(service_id)
+            return [
+                (category_id, names.get(category_id, "Uncategorized"), service_ids)
+                for category_id, service_ids in members.items()
+            ]
+        
+        tags_result = await db.execute(select(ServiceTag.id, ServiceTag.name).order_by(ServiceTag.name))
+        tags = tags_result.all()
+        links_result = await db.execute(select(service_tags.c.tag_id, service_tags.c.service_id))
+        members = {tag_id: [] for tag_id, _ in tags}
+        for tag_id, service_id in links_result.all():
+            members.setdefault(tag_id, []).append(service_id)
+        return [(tag_id, name, members[tag_id]) for tag_id, name in tags]
+    
+    async def get_availability_report(
+        self,
+        db: AsyncSession,
+        *,
+        start: datetime,
+        end: datetime,
+        group_by: str = "service"
+    ) -> Dict:
+        """Uptime, downtime, incidents, MTTR and latency percentiles per group"""
+        start_ms, end_ms = self.align_window(start, end)
+        service_totals = await self.get_service_totals(db, start_ms, end_ms)
+        
+        rows = []
+        for group_id, name, service_ids in await self.get_groups(db, group_by):
+            totals = AvailabilityTotals()
+            for service_id in service_ids:
+                if service_id in service_totals:
+                    totals.merge(service_totals[service_id])
+            
+            rows.append({
+                "id": group_id,
+                "name": name,
+                "service_count": len(service_ids),
+                "total_checks": totals.total_checks,
+                "uptime_percentage": (
+                    totals.healthy_checks / totals.total_checks * 100 if totals.total_checks else None
+                ),
+                "downtime_minutes": totals.downtime_ms / 60000,
+                "incident_count": totals.incident_count,
+                "mttr_minutes": (
+                    totals.repair_ms / totals.repaired_count / 60000 if totals.repaired_count else None
+                ),
+                "average_response_time": (
+                    totals.latency_sum / totals.latency_count if totals.latency_count else None
+                ),
+                "latency_p50": totals.percentile(0.50),
+                "latency_p95": totals.percentile(0.95),
+                "latency_p99": totals.percentile(0.99),
+            })
+        
+        return {
+            "start": datetime.utcfromtimestamp(start_ms / 1000),
+            "end": datetime.utcfromtimestamp(end_ms / 1000),
+            "group_by": group_by,
+            "rows": rows
+        }
+
+
+report_service = ReportService()
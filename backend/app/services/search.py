@@ -0,0 +1,234 @@
+"""Full-text search index for services
+
+SQLite uses an FTS5 table and PostgreSQL a weighted ``tsvector`` column with
+a GIN index. Both are kept in sync by database triggers on services, tags,
+categories and service_tags, so every write path (API, bulk operations,
+config import) updates the index without application code. Databases
+without either feature fall back to ``ilike`` matching.
+"""
+
+import re
+from typing import Optional
+from sqlalchemy import text, or_, select, Integer, Float
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+from app.models.service import Service
+
+
+# Document of one service: name, description, url, tag names, category name
+SQLITE_DOCUMENT = """
+    SELECT s.id, s.name, COALESCE(s.description, ''), s.url,
+        COALESCE((
+            SELECT group_concat(t.name, ' ') FROM service_tags st
+            JOIN tags t ON t.id = st.tag_id WHERE st.service_id = s.id
+        ), ''),
+        COALESCE((SELECT c.name FROM categories c WHERE c.id = s.category_id), '')
+    FROM services s WHERE {condition}
+"""
+
+SQLITE_REFRESH = """
+    DELETE FROM services_fts WHERE rowid IN ({ids});
+    INSERT INTO services_fts (rowid, name, description, url, tags, category)
+    """ + SQLITE_DOCUMENT.format(condition="s.id IN ({ids})") + ";"
+
+SQLITE_TRIGGERS = {
+    "services_fts_insert": ("AFTER INSERT ON services", "NEW.id"),
+    "services_fts_update": ("AFTER UPDATE OF name, description, url, category_id ON services", "NEW.id"),
+    "services_fts_delete": ("AFTER DELETE ON services", "OLD.id"),
+    "service_tags_fts_insert": ("AFTER INSERT ON service_tags", "NEW.service_id"),
+    "service_tags_fts_update": ("AFTER UPDATE ON service_tags", "OLD.service_id, NEW.service_id"),
+    "service_tags_fts_delete": ("AFTER DELETE ON service_tags", "OLD.service_id"),
+    "tags_fts_update": (
+        "AFTER UPDATE OF name ON tags",
+        "SELECT service_id FROM service_tags WHERE tag_id = NEW.id"
+    ),
+    "categories_fts_update": (
+        "AFTER UPDATE OF name ON categories",
+        "SELECT id FROM services WHERE category_id = NEW.id"
+    ),
+}
+
+POSTGRES_SETUP = (
+    """
+CREATE TABLE IF NOT EXISTS service_search (
+    service_id INTEGER PRIMARY KEY REFERENCES services (id) ON DELETE CASCADE,
+    document TSVECTOR NOT NULL
+)
+""",
+    "CREATE INDEX IF NOT EXISTS ix_service_search_document ON service_search USING GIN (document)",
+    """
+CREATE OR REPLACE FUNCTION service_search_refresh(target_ids INTEGER[]) RETURNS VOID AS $$
+BEGIN
+    DELETE FROM service_search WHERE service_id = ANY(target_ids);
+    INSERT INTO service_search (service_id, document)
+    SELECT s.id,
+        setweight(to_tsvector('simple', s.name), 'A') ||
+        setweight(to_tsvector('simple', COALESCE((
+            SELECT string_agg(t.name, ' ') FROM service_tags st
+            JOIN tags t ON t.id = st.tag_id WHERE st.service_id = s.id
+        ), '')), 'B') ||
+        setweight(to_tsvector('simple', COALESCE((
+            SELECT c.name FROM categories c WHERE c.id = s.category_id
+        ), '')), 'B') ||
+        setweight(to_tsvector('simple',
+            COALESCE(s.description, '') || ' ' || regexp_replace(s.url, '[^[:alnum:]]+', ' ', 'g')
+        ), 'C')
+    FROM services s WHERE s.id = ANY(target_ids);
+END;
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE OR REPLACE FUNCTION service_search_on_services() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM service_search_refresh(ARRAY[NEW.id]);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE OR REPLACE FUNCTION service_search_on_service_tags() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM service_search_refresh(ARRAY[NEW.service_id]);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM service_search_refresh(ARRAY[OLD.service_id]);
+    ELSE
+        PERFORM service_search_refresh(ARRAY[OLD.service_id, NEW.service_id]);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE OR REPLACE FUNCTION service_search_on_tags() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM service_search_refresh(ARRAY(SELECT service_id FROM service_tags WHERE tag_id = NEW.id));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE OR REPLACE FUNCTION service_search_on_categories() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM service_search_refresh(ARRAY(SELECT id FROM services WHERE category_id = NEW.id));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    "DROP TRIGGER IF EXISTS service_search_services ON services",
+    """
+CREATE TRIGGER service_search_services AFTER INSERT OR UPDATE OF name, description, url, category_id
+    ON services FOR EACH ROW EXECUTE FUNCTION service_search_on_services()
+""",
+    "DROP TRIGGER IF EXISTS service_search_service_tags ON service_tags",
+    """
+CREATE TRIGGER service_search_service_tags AFTER INSERT OR UPDATE OR DELETE
+    ON service_tags FOR EACH ROW EXECUTE FUNCTION service_search_on_service_tags()
+""",
+    "DROP TRIGGER IF EXISTS service_search_tags ON tags",
+    """
+CREATE TRIGGER service_search_tags AFTER UPDATE OF name
+    ON tags FOR EACH ROW EXECUTE FUNCTION service_search_on_tags()
+""",
+    "DROP TRIGGER IF EXISTS service_search_categories ON categories",
+    """
+CREATE TRIGGER service_search_categories AFTER UPDATE OF name
+    ON categories FOR EACH ROW EXECUTE FUNCTION service_search_on_categories()
+""",
+)
+
+
+class SearchIndex:
+    """Ranked, prefix-matching service search over a database full-text index"""
+    
+    # bm25 column weights: name, description, url, tags, category
+    SQLITE_WEIGHTS = (10.0, 1.0, 2.0, 5.0, 3.0)
+    
+    def __init__(self):
+        self.backend: Optional[str] = None  # "sqlite", "postgresql" or None for ilike
+    
+    def install(self, conn: Connection) -> None:
+        """Create the index and its triggers if missing, populating it on first install"""
+        dialect = conn.dialect.name
+        if dialect == "sqlite":
+            self._install_sqlite(conn)
+        elif dialect == "postgresql":
+            self._install_postgresql(conn)
+    
+    def _install_sqlite(self, conn: Connection) -> None:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'services_fts'")
+        ).first()
+        if not exists:
+            try:
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE services_fts USING fts5("
+                    "name, description, url, tags, category, tokenize = 'unicode61 remove_diacritics 2')"
+                ))
+            except OperationalError:
+                # SQLite built without FTS5
+                return
+            conn.execute(text(
+                "INSERT INTO services_fts (rowid, name, description, url, tags, category) "
+                + SQLITE_DOCUMENT.format(condition="1 = 1")
+            ))
+        
+        for name, (event, ids) in SQLITE_TRIGGERS.items():
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN "
+                + SQLITE_REFRESH.format(ids=ids)
+                + " END"
+            ))
+        self.backend = "sqlite"
+    
+    def _install_postgresql(self, conn: Connection) -> None:
+        exists = conn.execute(text("SELECT to_regclass('service_search')")).scalar()
+        for statement in POSTGRES_SETUP:
+            conn.exec_driver_sql(statement)
+        if not exists:
+            conn.execute(text("SELECT service_search_refresh(ARRAY(SELECT id FROM services))"))
+        self.backend = "postgresql"
+    
+    @staticmethod
+    def terms(search: str) -> list:
+        """Split a search string into plain word terms"""
+        return [term for term in re.split(r"[^\w]+", search) if term]
+    
+    def ranked(self, search: str):
+        """Subquery of (service_id, rank) matching a search, lower rank first
+        
+        Every term must match, each as a prefix. Returns None when there is
+        no full-text backend or nothing searchable in the input.
+        """
+        terms = self.terms(search)
+        if self.backend is None or not terms:
+            return None
+        
+        if self.backend == "sqlite":
+            weights = ", ".join(str(weight) for weight in self.SQLITE_WEIGHTS)
+            statement = text(
+                f"SELECT rowid AS service_id, bm25(services_fts, {weights}) AS rank "
+                "FROM services_fts WHERE services_fts MATCH :query"
+            ).bindparams(query=" ".join(f'"{term}"*' for term in terms))
+        else:
+            statement = text(
+                "SELECT service_id, -ts_rank(document, to_tsquery('simple', :query)) AS rank "
+                "FROM service_search WHERE document @@ to_tsquery('simple', :query)"
+            ).bindparams(query=" & ".join(f"{term}:*" for term in terms))
+        
+        return statement.columns(service_id=Integer, rank=Float).subquery("search_rank")
+    
+    def filter(self, search: str):
+        """Filter clause restricting services to those matching a search"""
+        ranked = self.ranked(search)
+        if ranked is not None:
+            return Service.id.in_(select(ranked.c.service_id))
+        return or_(
+            Service.name.ilike(f"%{search}%"),
+            Service.description.ilike(f"%{search}%"),
+            Service.url.ilike(f"%{search}%")
+        )
+
+
+search_index = SearchIndex()
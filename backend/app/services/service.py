@@ -1,20 +1,68 @@
 """Service management business logic"""
 
-from typing import List, Optional, Dict, Any
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Sequence, Tuple, AsyncIterator
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, delete, or_, and_, func, false
+from sqlalchemy.orm import selectinload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models.service import Service, ServiceTag, service_tags
+from app.core.cache import cache
+from app.core.data_version import data_versions, record_rows
+from app.core.pagination import encode_cursor, decode_cursor, keyset_filter
+from app.models.category import Category
+from app.models.service import Service, ServiceTag, service_tags, service_dependencies
+from app.services.anomaly import latency_detector
 from app.services.base import BaseService
-from app.schemas.service import ServiceCreate, ServiceUpdate
+from app.services.bitmap_index import service_bitmap_index
+from app.services.search import search_index
+from app.schemas.service import (
+    ServiceCreate,
+    ServiceUpdate,
+    ServiceInDB,
+    CategoryInService,
+    TagInService,
+)
+
+
+SERVICE_FIELDS = tuple(ServiceInDB.model_fields)
+CATEGORY_FIELDS = tuple(CategoryInService.model_fields)
+TAG_FIELDS = tuple(TagInService.model_fields)
+
+
+def serialize_service(service, fields: Optional[List[str]], include: List[str]) -> dict:
+    """Plain dict of the given fields and relations of a service
+    
+    Loaded rows are trusted, so this skips Pydantic validation; with all
+    fields and relations it matches ``ServiceResponse``.
+    """
+    item = {field: getattr(service, field) for field in fields or SERVICE_FIELDS}
+    if "category" in include:
+        category = service.category
+        item["category"] = (
+            {field: getattr(category, field) for field in CATEGORY_FIELDS} if category is not None else None
+        )
+    if "tags" in include:
+        item["tags"] = [{field: getattr(tag, field) for field in TAG_FIELDS} for tag in service.tags]
+    return item
 
 
 class ServiceService(BaseService[Service]):
     """Service management service"""
     
+    COUNT_STRATEGIES = ("exact", "cached", "none")
+    RELATIONS = ("category", "tags")
+    # Columns the list always needs for its order and cursor
+    LIST_KEY_COLUMNS = ("id", "sort_order", "created_at")
+    COUNT_CACHE_SIZE = 1024
+    BITMAP_MAX_IDS = 1000
+    
     def __init__(self):
         super().__init__(Service)
+        # Filter key -> (services data version, total)
+        self._count_cache: Dict[tuple, Tuple[int, int]] = {}
     
     async def get_with_relations(self, db: AsyncSession, id: int) -> Optional[Service]:
         """Get service with category and tags"""
@@ -26,39 +74,31 @@ class ServiceService(BaseService[Service]):
         )
         return result.scalar_one_or_none()
     
-    async def get_multi_with_relations(
+    def build_filters(
         self,
-        db: AsyncSession,
         *,
-        skip: int = 0,
-        limit: int = 100,
+        service_ids: Optional[List[int]] = None,
         category_id: Optional[int] = None,
+        category_ids: Optional[List[int]] = None,
         tag_ids: Optional[List[int]] = None,
         status: Optional[str] = None,
         is_active: Optional[bool] = None,
         search: Optional[str] = None
-    ) -> tuple[List[Service], int]:
-        """Get services with filters and pagination"""
-        query = select(Service).options(
-            selectinload(Service.category),
-            selectinload(Service.tags)
-        )
-        
-        # Apply filters
+    ) -> list:
+        """Build filter clauses shared by service listing and selection"""
         filters = []
+        if service_ids:
+            filters.append(Service.id.in_(service_ids))
         if category_id is not None:
             filters.append(Service.category_id == category_id)
+        if category_ids:
+            filters.append(Service.category_id.in_(category_ids))
         if status is not None:
             filters.append(Service.status == status)
         if is_active is not None:
             filters.append(Service.is_active == is_active)
         if search:
-            search_filter = or_(
-                Service.name.ilike(f"%{search}%"),
-                Service.description.ilike(f"%{search}%"),
-                Service.url.ilike(f"%{search}%")
-            )
-            filters.append(search_filter)
+            filters.append(search_index.filter(search))
         
         if tag_ids:
             # Filter by tags using subquery
@@ -71,24 +111,366 @@ class ServiceService(BaseService[Service]):
             )
             filters.append(Service.id.in_(select(tag_subquery)))
         
-        if filters:
-            query = query.filter(and_(*filters))
+        return filters
+    
+    async def resolve_filters(
+        self,
+        db: AsyncSession,
+        *,
+        service_ids: Optional[List[int]] = None,
+        category_id: Optional[int] = None,
+        category_ids: Optional[List[int]] = None,
+        tag_ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        search: Optional[str] = None
+    ) -> list:
+        """Build filter clauses, resolving attribute filters through the bitmap index
+        
+        Matches become a primary-key filter unless there are more than
+        ``BITMAP_MAX_IDS`` of them, in which case the SQL filters are used.
+        """
+        ids = await service_bitmap_index.lookup(
+            db,
+            service_ids=service_ids,
+            category_id=category_id,
+            category_ids=category_ids,
+            tag_ids=tag_ids,
+            status=status,
+            is_active=is_active
+        )
+        if ids is None or len(ids) > self.BITMAP_MAX_IDS:
+            return self.build_filters(
+                service_ids=service_ids,
+                category_id=category_id,
+                category_ids=category_ids,
+                tag_ids=tag_ids,
+                status=status,
+                is_active=is_active,
+                search=search
+            )
+        
+        filters = [Service.id.in_(ids)]
+        if search:
+            filters.append(search_index.filter(search))
+        return filters
+    
+    async def get_multi_with_relations(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        category_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        search: Optional[str] = None,
+        count: str = "exact",
+        fields: Optional[List[str]] = None,
+        include: Sequence[str] = RELATIONS
+    ) -> Tuple[List[Service], Optional[int], Optional[str]]:
+        """Get services with filters and pagination
+        
+        Pages by ``skip`` or, when a ``cursor`` is given, by keyset on the list
+        order (relevance, sort_order, created_at desc, id desc). Either way the
+        returned cursor continues after the last row of the page.
+        
+        ``count`` picks how the total is found: ``exact`` windows it into the
+        page query, ``cached`` reuses a total for the same filters until the
+        next write, and ``none`` skips it and returns None.
         
-        # Get total count
+        ``fields`` limits the columns loaded and ``include`` the relations.
+        """
+        query = select(Service).options(*self.list_options(fields, include))
         count_query = select(func.count()).select_from(Service)
+        keys = [
+            (Service.sort_order, False),
+            (Service.created_at, True),
+            (Service.id, True),
+        ]
+        
+        # Full-text matches are joined so they can be ordered by relevance
+        ranked = search_index.ranked(search) if search else None
+        if ranked is not None:
+            query = query.join(ranked, ranked.c.service_id == Service.id).add_columns(ranked.c.rank)
+            count_query = count_query.join(ranked, ranked.c.service_id == Service.id)
+            keys.insert(0, (ranked.c.rank, False))
+        
+        # Apply filters
+        filters = await self.resolve_filters(
+            db,
+            category_id=category_id,
+            tag_ids=tag_ids,
+            status=status,
+            is_active=is_active,
+            search=search if ranked is None else None
+        )
+        
         if filters:
+            query = query.filter(and_(*filters))
             count_query = count_query.filter(and_(*filters))
+        
+        total = None
+        count_key = (category_id, tuple(sorted(tag_ids or ())), status, is_active, search)
+        if count == "cached":
+            total = await self.get_cached_count(db, count_key, count_query)
+        elif count == "exact" and not cursor:
+            # Counted before OFFSET/LIMIT apply, so one query gives page and total
+            query = query.add_columns(func.count().over().label("total"))
+        
+        # Apply pagination and sorting
+        if cursor:
+            query = query.filter(keyset_filter(keys, self.decode_list_cursor(cursor, len(keys))))
+        else:
+            query = query.offset(skip)
+        query = query.order_by(*[column.desc() if descending else column for column, descending in keys])
+        
+        result = await db.execute(query.limit(limit + 1))
+        rows = result.all()
+        
+        if count == "exact":
+            if rows and not cursor:
+                total = rows[0].total
+            else:
+                # Keyset filters and pages past the end leave nothing to window over
+                total_result = await db.execute(count_query)
+                total = total_result.scalar_one()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            values = [last[0].sort_order, last[0].created_at.isoformat(), last[0].id]
+            if ranked is not None:
+                values.insert(0, last.rank)
+            next_cursor = encode_cursor(values)
+        
+        return [row[0] for row in rows], total, next_cursor
+    
+    async def get_cached_count(self, db: AsyncSession, key: tuple, count_query) -> int:
+        """Total for a filter key, counted again only after services change"""
+        version = data_versions.get("services")
+        cached = self._count_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
         total_result = await db.execute(count_query)
         total = total_result.scalar_one()
+        if len(self._count_cache) >= self.COUNT_CACHE_SIZE:
+            self._count_cache.clear()
+        self._count_cache[key] = (version, total)
+        return total
+    
+    def list_options(self, fields: Optional[List[str]], include: Sequence[str]) -> list:
+        """Loader options fetching only the given columns and relations"""
+        options = []
+        if fields is not None:
+            columns = set(fields) | set(self.LIST_KEY_COLUMNS)
+            options.append(load_only(*[getattr(Service, column) for column in sorted(columns)]))
+        for relation in include:
+            options.append(selectinload(getattr(Service, relation)))
+        return options
+    
+    async def get_list_page(
+        self,
+        db: AsyncSession,
+        *,
+        page: int = 1,
+        size: int = 20,
+        cursor: Optional[str] = None,
+        category_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        search: Optional[str] = None,
+        count: str = "exact",
+        fields: Optional[List[str]] = None,
+        include: Sequence[str] = RELATIONS
+    ) -> Dict[str, Any]:
+        """One page of the service list as a plain, cached response body"""
+        params = {
+            "page": page, "size": size, "cursor": cursor, "category_id": category_id,
+            "tag_ids": tag_ids, "status": status, "is_active": is_active, "search": search,
+            "count": count, "fields": fields, "include": list(include),
+        }
         
-        # Apply pagination and sorting
-        query = query.order_by(Service.sort_order, Service.created_at.desc())
-        query = query.offset(skip).limit(limit)
+        async def load() -> Dict[str, Any]:
+            services, total, next_cursor = await self.get_multi_with_relations(
+                db,
+                skip=(page - 1) * size,
+                limit=size,
+                cursor=cursor,
+                category_id=category_id,
+                tag_ids=tag_ids,
+                status=status,
+                is_active=is_active,
+                search=search,
+                count=count,
+                fields=fields,
+                include=include
+            )
+            return {
+                "total": total,
+                "page": None if cursor else page,
+                "size": size,
+                "items": [serialize_service(service, fields, include) for service in services],
+                "has_more": next_cursor is not None,
+                "next_cursor": next_cursor
+            }
+        
+        key = "services:list:" + orjson.dumps(params, option=orjson.OPT_SORT_KEYS).decode()
+        return await cache.get_or_load(key, ("services",), load)
+    
+    @staticmethod
+    def decode_list_cursor(cursor: str, length: int) -> List[Any]:
+        """Decode a service list cursor into typed sort key values"""
+        values = decode_cursor(cursor)
+        if len(values) != length:
+            raise ValueError("Invalid cursor")
+        *rank, sort_order, created_at, service_id = values
+        if not all(isinstance(value, (int, float)) for value in rank):
+            raise ValueError("Invalid cursor")
+        if not isinstance(sort_order, int) or not isinstance(service_id, int) or not isinstance(created_at, str):
+            raise ValueError("Invalid cursor")
+        return [*rank, sort_order, datetime.fromisoformat(created_at), service_id]
+    
+    async def get_selection(
+        self,
+        db: AsyncSession,
+        *,
+        service_ids: Optional[List[int]] = None,
+        category_ids: Optional[List[int]] = None,
+        tag_ids: Optional[List[int]] = None,
+        is_active: Optional[bool] = None
+    ) -> List[Service]:
+        """Get the union of some services, the services of some categories
+        and the services with any of some tags
+        
+        ``is_active``, when given, applies to the whole selection.
+        """
+        selected = []
+        if service_ids:
+            selected.append(Service.id.in_(service_ids))
+        if category_ids:
+            selected.append(Service.category_id.in_(category_ids))
+        if tag_ids:
+            selected.append(Service.id.in_(
+                select(service_tags.c.service_id).where(service_tags.c.tag_id.in_(tag_ids))
+            ))
         
-        result = await db.execute(query)
-        services = result.scalars().all()
+        query = select(Service).filter(or_(*selected) if selected else false())
+        if is_active is not None:
+            query = query.filter(Service.is_active == is_active)
         
-        return services, total
+        result = await db.execute(query.order_by(Service.sort_order, Service.id))
+        return result.scalars().all()
+    
+    async def get_facets(
+        self,
+        db: AsyncSession,
+        *,
+        category_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        search: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Count services matching the list filters per category, tag and status
+        
+        Counted from the bitmap index by AND-ing the filtered bitset with each
+        value's bitset; only a search costs a query, for its matching IDs.
+        """
+        bitmap = await service_bitmap_index.match(
+            db,
+            category_id=category_id,
+            tag_ids=tag_ids,
+            status=status,
+            is_active=is_active
+        )
+        if search:
+            result = await db.execute(select(Service.id).filter(search_index.filter(search)))
+            bitmap &= service_bitmap_index.bitmap_of(result.scalars())
+        
+        counts = service_bitmap_index.counts(bitmap)
+        categories = counts["category"]
+        return {
+            "total": bitmap.bit_count(),
+            "categories": {key: count for key, count in categories.items() if key is not None},
+            "uncategorized": categories.get(None, 0),
+            "tags": counts["tag"],
+            "statuses": counts["status"],
+        }
+    
+    async def stream_catalog(
+        self,
+        db: AsyncSession,
+        *,
+        category_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        search: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[dict]:
+        """Yield every matching service with its category and tag names, by ID
+        
+        Rows come from a server-side cursor ``batch_size`` at a time, one per
+        service and tag, and are folded into services as they arrive, so
+        memory stays flat however large the catalog.
+        """
+        filters = await self.resolve_filters(
+            db,
+            category_id=category_id,
+            tag_ids=tag_ids,
+            status=status,
+            is_active=is_active,
+            search=search
+        )
+        query = (
+            select(
+                *(getattr(Service, field) for field in SERVICE_FIELDS),
+                Category.name.label("category_name"),
+                ServiceTag.name.label("tag_name")
+            )
+            .outerjoin(Category, Category.id == Service.category_id)
+            .outerjoin(service_tags, service_tags.c.service_id == Service.id)
+            .outerjoin(ServiceTag, ServiceTag.id == service_tags.c.tag_id)
+            .filter(*filters)
+            .order_by(Service.id, ServiceTag.name)
+            .execution_options(yield_per=batch_size)
+        )
+        
+        item = None
+        result = await db.stream(query)
+        async for row in result:
+            if item is None or item["id"] != row.id:
+                if item is not None:
+                    yield item
+                item = {field: getattr(row, field) for field in SERVICE_FIELDS}
+                item["category"] = row.category_name
+                item["tags"] = []
+            if row.tag_name is not None:
+                item["tags"].append(row.tag_name)
+        if item is not None:
+            yield item
+    
+    async def get_loaded(self, db: AsyncSession, model, ids: Sequence[int]) -> list:
+        """Rows of ``model`` with the given IDs, in order, querying only for those not in the session"""
+        ids = list(dict.fromkeys(ids))
+        objects = {}
+        missing = []
+        for id in ids:
+            obj = db.identity_map.get(db.identity_key(model, id))
+            if obj is None:
+                missing.append(id)
+            else:
+                objects[id] = obj
+        if missing:
+            result = await db.execute(select(model).filter(model.id.in_(missing)))
+            objects.update((obj.id, obj) for obj in result.scalars())
+        return [objects[id] for id in ids if id in objects]
     
     async def create_with_tags(
         self,
@@ -96,34 +478,90 @@ class ServiceService(BaseService[Service]):
         *,
         obj_in: ServiceCreate
     ) -> Service:
-        """Create service with tags"""
+        """Create service with tags
+        
+        The category and tags are attached as loaded objects and the insert
+        fills in every column, so the service is returned without a reload.
+        """
         # Extract tags from input
-        tag_ids = obj_in.tags if hasattr(obj_in, 'tags') else []
+        tag_ids = obj_in.tags or []
         service_data = obj_in.model_dump(exclude={'tags'})
         
-        # Create service
+        category = None
+        if service_data["category_id"] is not None:
+            category = await self.get_category(db, service_data["category_id"])
+        
         db_service = Service(**service_data)
+        db_service.category = category
+        db_service.tags = await self.get_loaded(db, ServiceTag, tag_ids) if tag_ids else []
         db.add(db_service)
-        await db.flush()
+        await db.commit()
+        return db_service
+    
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        *,
+        items: List[Tuple[int, ServiceCreate]]
+    ) -> Tuple[Dict[int, int], List[Dict[str, Any]]]:
+        """Insert many services and their tags with multi-row inserts in one transaction
+        
+        ``items`` pairs each service with its index in the request. Items
+        naming a missing category or tag are rejected; returns the new ID by
+        index and the rejections.
+        """
+        category_ids = {item.category_id for _, item in items if item.category_id is not None}
+        tag_ids = {tag_id for _, item in items for tag_id in item.tags or ()}
         
-        # Add tags
+        existing_categories = set()
+        if category_ids:
+            result = await db.execute(select(Category.id).filter(Category.id.in_(category_ids)))
+            existing_categories = set(result.scalars().all())
+        existing_tags = set()
         if tag_ids:
-            tags = await db.execute(
-                select(ServiceTag).filter(ServiceTag.id.in_(tag_ids))
-            )
-            db_service.tags = tags.scalars().all()
+            result = await db.execute(select(ServiceTag.id).filter(ServiceTag.id.in_(tag_ids)))
+            existing_tags = set(result.scalars().all())
         
-        await db.commit()
-        await db.refresh(db_service)
+        valid = []
+        errors = []
+        for index, item in items:
+            if item.category_id is not None and item.category_id not in existing_categories:
+                errors.append({"index": index, "detail": f"Category {item.category_id} not found"})
+                continue
+            missing_tags = sorted(set(item.tags or ()) - existing_tags)
+            if missing_tags:
+                errors.append({"index": index, "detail": f"Tags not found: {missing_tags}"})
+                continue
+            valid.append((index, item))
         
-        # Load relationships
+        if not valid:
+            return {}, errors
+        
+        # Keeping RETURNING in parameter order costs SQLite one statement per
+        # row; its rowids are assigned in insert order, so sorting restores it
+        ordered = db.bind.dialect.name != "sqlite"
         result = await db.execute(
-            select(Service)
-            .options(selectinload(Service.category))
-            .options(selectinload(Service.tags))
-            .filter(Service.id == db_service.id)
+            insert(Service)
+            .returning(Service.id, sort_by_parameter_order=ordered)
+            .execution_options(changed_rows=()),
+            [item.model_dump(exclude={"tags"}) for _, item in valid]
         )
-        return result.scalar_one()
+        ids = result.scalars().all() if ordered else sorted(result.scalars().all())
+        record_rows(db.sync_session, Service.__tablename__, ids)
+        
+        links = [
+            {"service_id": service_id, "tag_id": tag_id}
+            for service_id, (_, item) in zip(ids, valid)
+            for tag_id in dict.fromkeys(item.tags or ())
+        ]
+        if links:
+            await db.execute(
+                insert(service_tags).execution_options(changed_rows=ids),
+                links
+            )
+        
+        await db.commit()
+        return {index: service_id for (index, _), service_id in zip(valid, ids)}, errors
     
     async def update_with_tags(
         self,
@@ -132,36 +570,67 @@ class ServiceService(BaseService[Service]):
         db_obj: Service,
         obj_in: ServiceUpdate
     ) -> Service:
-        """Update service with tags"""
+        """Update service with tags
+        
+        Tags are replaced with set-based statements rather than through the
+        collection, which would have to load first; the relations are then
+        filled in from rows already in the session where possible.
+        """
         update_data = obj_in.model_dump(exclude_unset=True)
         tag_ids = update_data.pop('tags', None)
         
+        category = None
+        if update_data.get("category_id") is not None:
+            category = await self.get_category(db, update_data["category_id"])
+        elif "category_id" not in update_data and db_obj.category_id is not None:
+            category = next(iter(await self.get_loaded(db, Category, [db_obj.category_id])), None)
+        
         # Update basic fields
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         
-        # Update tags if provided
         if tag_ids is not None:
-            if tag_ids:
-                tags = await db.execute(
-                    select(ServiceTag).filter(ServiceTag.id.in_(tag_ids))
+            tags = await self.get_loaded(db, ServiceTag, tag_ids) if tag_ids else []
+            await db.execute(
+                service_tags.delete()
+                .where(service_tags.c.service_id == db_obj.id)
+                .execution_options(changed_rows=[db_obj.id])
+            )
+            if tags:
+                await db.execute(
+                    insert(service_tags).execution_options(changed_rows=[db_obj.id]),
+                    [{"service_id": db_obj.id, "tag_id": tag.id} for tag in tags]
                 )
-                db_obj.tags = tags.scalars().all()
-            else:
-                db_obj.tags = []
+        else:
+            result = await db.execute(
+                select(ServiceTag)
+                .join(service_tags, service_tags.c.tag_id == ServiceTag.id)
+                .filter(service_tags.c.service_id == db_obj.id)
+            )
+            tags = result.scalars().all()
         
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         
-        # Load relationships
-        result = await db.execute(
-            select(Service)
-            .options(selectinload(Service.category))
-            .options(selectinload(Service.tags))
-            .filter(Service.id == db_obj.id)
-        )
-        return result.scalar_one()
+        # The foreign key column already holds the new value, so the relations
+        # are set as loaded state rather than as changes to flush
+        set_committed_value(db_obj, "category", category)
+        set_committed_value(db_obj, "tags", list(tags))
+        return db_obj
+    
+    async def get_category(self, db: AsyncSession, category_id: int) -> Category:
+        """Category a service is being assigned to, which must exist"""
+        category = next(iter(await self.get_loaded(db, Category, [category_id])), None)
+        if category is None:
+            raise ValueError(f"Category {category_id} not found")
+        return category
+    
+    async def delete(self, db: AsyncSession, *, id: int) -> Optional[Service]:
+        """Delete a service and forget its latency baseline"""
+        service = await super().delete(db, id=id)
+        if service:
+            latency_detector.reset(id)
+        return service
     
     async def bulk_delete(
         self,
@@ -169,18 +638,20 @@ class ServiceService(BaseService[Service]):
         *,
         service_ids: List[int]
     ) -> int:
-        """Bulk delete services"""
+        """Bulk delete services with one DELETE statement
+        
+        Tags links, dependencies and health history go with them through the
+        database's ON DELETE rules, without being loaded.
+        """
         result = await db.execute(
-            select(Service).filter(Service.id.in_(service_ids))
+            delete(Service)
+            .where(Service.id.in_(service_ids))
+            .execution_options(synchronize_session=False, changed_rows=service_ids)
         )
-        services = result.scalars().all()
-        
-        count = len(services)
-        for service in services:
-            await db.delete(service)
-        
         await db.commit()
-        return count
+        for service_id in service_ids:
+            latency_detector.reset(service_id)
+        return result.rowcount
     
     async def bulk_update(
         self,
@@ -189,19 +660,19 @@ class ServiceService(BaseService[Service]):
         service_ids: List[int],
         update_data: Dict[str, Any]
     ) -> List[Service]:
-        """Bulk update services"""
-        result = await db.execute(
-            select(Service).filter(Service.id.in_(service_ids))
-        )
-        services = result.scalars().all()
+        """Bulk update services with one UPDATE statement"""
+        values = {field: value for field, value in update_data.items() if hasattr(Service, field)}
+        if values.get("category_id") is not None:
+            await self.get_category(db, values["category_id"])
         
-        for service in services:
-            for field, value in update_data.items():
-                if hasattr(service, field):
-                    setattr(service, field, value)
-            db.add(service)
-        
-        await db.commit()
+        if values:
+            await db.execute(
+                update(Service)
+                .where(Service.id.in_(service_ids))
+                .values(**values)
+                .execution_options(synchronize_session=False, changed_rows=service_ids)
+            )
+            await db.commit()
         
         # Reload with relationships
         result = await db.execute(
@@ -209,9 +680,86 @@ class ServiceService(BaseService[Service]):
             .options(selectinload(Service.category))
             .options(selectinload(Service.tags))
             .filter(Service.id.in_(service_ids))
+            .execution_options(populate_existing=True)
         )
         return result.scalars().all()
     
+    async def get_dependency_map(
+        self,
+        db: AsyncSession
+    ) -> Dict[int, List[int]]:
+        """Map each service ID to the IDs of the services it depends on"""
+        result = await db.execute(
+            select(service_dependencies.c.service_id, service_dependencies.c.depends_on_id)
+        )
+        dependency_map = defaultdict(list)
+        for service_id, depends_on_id in result.all():
+            dependency_map[service_id].append(depends_on_id)
+        return dependency_map
+    
+    async def get_dependencies(
+        self,
+        db: AsyncSession,
+        service_id: int
+    ) -> Dict[str, Any]:
+        """Get upstream and downstream dependency IDs of a service"""
+        result = await db.execute(
+            select(service_dependencies.c.service_id, service_dependencies.c.depends_on_id)
+            .filter(or_(
+                service_dependencies.c.service_id == service_id,
+                service_dependencies.c.depends_on_id == service_id
+            ))
+        )
+        edges = result.all()
+        
+        return {
+            "service_id": service_id,
+            "depends_on": sorted(upstream for downstream, upstream in edges if downstream == service_id),
+            "dependents": sorted(downstream for downstream, upstream in edges if upstream == service_id)
+        }
+    
+    async def set_dependencies(
+        self,
+        db: AsyncSession,
+        *,
+        service_id: int,
+        depends_on: List[int]
+    ) -> Dict[str, Any]:
+        """Replace the upstream dependencies of a service"""
+        depends_on = sorted(set(depends_on))
+        if service_id in depends_on:
+            raise ValueError("A service cannot depend on itself")
+        
+        if depends_on:
+            result = await db.execute(select(Service.id).filter(Service.id.in_(depends_on)))
+            missing = set(depends_on) - set(result.scalars().all())
+            if missing:
+                raise ValueError(f"Services not found: {sorted(missing)}")
+        
+        # Reject edges that would close a cycle back to this service
+        dependency_map = await self.get_dependency_map(db)
+        stack = list(depends_on)
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current == service_id:
+                raise ValueError("Dependencies would create a cycle")
+            if current not in seen:
+                seen.add(current)
+                stack.extend(dependency_map.get(current, []))
+        
+        await db.execute(
+            service_dependencies.delete().where(service_dependencies.c.service_id == service_id)
+        )
+        if depends_on:
+            await db.execute(
+                service_dependencies.insert(),
+                [{"service_id": service_id, "depends_on_id": upstream_id} for upstream_id in depends_on]
+            )
+        await db.commit()
+        
+        return await self.get_dependencies(db, service_id)
+    
     async def update_health_status(
         self,
         db: AsyncSession,
@@ -0,0 +1,132 @@
+"""Maintained service counts on categories and tags
+
+``categories.service_count`` and ``tags.service_count`` are kept by database
+triggers on services and service_tags, so every write path (API, bulk
+statements, ON DELETE cascades, tag merges, config import) updates them in
+the same transaction without application code. ``verify`` and ``repair``
+compare them with a recount, for databases written before the triggers.
+"""
+
+from typing import Dict, List
+from sqlalchemy import select, update, func
+from sqlalchemy.engine import Connection
+
+from app.models.category import Category
+from app.models.service import Service, ServiceTag, service_tags
+
+
+def _increment(table: str, id: str, delta: str) -> str:
+    return f"UPDATE {table} SET service_count = service_count {delta} 1 WHERE id = {id};"
+
+
+SQLITE_TRIGGERS = {
+    "services_count_insert": ("AFTER INSERT ON services", _increment("categories", "NEW.category_id", "+")),
+    "services_count_delete": ("AFTER DELETE ON services", _increment("categories", "OLD.category_id", "-")),
+    "services_count_update": (
+        "AFTER UPDATE OF category_id ON services WHEN OLD.category_id IS NOT NEW.category_id",
+        _increment("categories", "OLD.category_id", "-") + _increment("categories", "NEW.category_id", "+")
+    ),
+    "service_tags_count_insert": ("AFTER INSERT ON service_tags", _increment("tags", "NEW.tag_id", "+")),
+    "service_tags_count_delete": ("AFTER DELETE ON service_tags", _increment("tags", "OLD.tag_id", "-")),
+    "service_tags_count_update": (
+        "AFTER UPDATE OF tag_id ON service_tags WHEN OLD.tag_id IS NOT NEW.tag_id",
+        _increment("tags", "OLD.tag_id", "-") + _increment("tags", "NEW.tag_id", "+")
+    ),
+}
+
+POSTGRES_SETUP = (
+    """
+CREATE OR REPLACE FUNCTION service_counts_on_services() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.category_id IS NOT DISTINCT FROM NEW.category_id THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        """ + _increment("categories", "OLD.category_id", "-") + """
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        """ + _increment("categories", "NEW.category_id", "+") + """
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE OR REPLACE FUNCTION service_counts_on_service_tags() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.tag_id IS NOT DISTINCT FROM NEW.tag_id THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        """ + _increment("tags", "OLD.tag_id", "-") + """
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        """ + _increment("tags", "NEW.tag_id", "+") + """
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    "DROP TRIGGER IF EXISTS service_counts_services ON services",
+    """
+CREATE TRIGGER service_counts_services AFTER INSERT OR DELETE OR UPDATE OF category_id
+    ON services FOR EACH ROW EXECUTE FUNCTION service_counts_on_services()
+""",
+    "DROP TRIGGER IF EXISTS service_counts_service_tags ON service_tags",
+    """
+CREATE TRIGGER service_counts_service_tags AFTER INSERT OR DELETE OR UPDATE OF tag_id
+    ON service_tags FOR EACH ROW EXECUTE FUNCTION service_counts_on_service_tags()
+""",
+)
+
+
+class ServiceCounts:
+    """Installs, verifies and repairs the maintained service counts"""
+    
+    def install(self, conn: Connection) -> None:
+        """Create the counting triggers if missing"""
+        dialect = conn.dialect.name
+        if dialect == "sqlite":
+            for name, (event, body) in SQLITE_TRIGGERS.items():
+                conn.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+        elif dialect == "postgresql":
+            for statement in POSTGRES_SETUP:
+                conn.exec_driver_sql(statement)
+    
+    @staticmethod
+    def _recounts():
+        """(table, recount subquery) for each counted table"""
+        categories = Category.__table__
+        tags = ServiceTag.__table__
+        return (
+            (categories, select(func.count()).where(Service.__table__.c.category_id == categories.c.id).scalar_subquery()),
+            (tags, select(func.count()).where(service_tags.c.tag_id == tags.c.id).scalar_subquery()),
+        )
+    
+    def verify(self, conn: Connection) -> List[Dict]:
+        """Rows whose stored count differs from a recount"""
+        mismatches = []
+        for table, actual in self._recounts():
+            rows = conn.execute(
+                select(table.c.id, table.c.service_count, actual.label("actual"))
+                .where(table.c.service_count != actual)
+                .order_by(table.c.id)
+            )
+            mismatches.extend(
+                {"table": table.name, "id": id, "stored": stored, "actual": count}
+                for id, stored, count in rows
+            )
+        return mismatches
+    
+    def repair(self, conn: Connection) -> int:
+        """Overwrite wrong counts with a recount, returning how many were fixed"""
+        fixed = 0
+        for table, actual in self._recounts():
+            result = conn.execute(
+                update(table).where(table.c.service_count != actual).values(service_count=actual)
+            )
+            fixed += result.rowcount
+        return fixed
+
+
+service_counts = ServiceCounts()
@@ -2,9 +2,9 @@
 
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select
 
+from app.core.cache import cache
 from app.models.service import ServiceTag, service_tags
 from app.services.base import BaseService
 
@@ -15,50 +15,30 @@ class TagService(BaseService[ServiceTag]):
     def __init__(self):
         super().__init__(ServiceTag)
     
+    @staticmethod
+    def to_dict(tag: ServiceTag) -> dict:
+        """Plain column values of a tag, so it can be cached"""
+        return {column.key: getattr(tag, column.key) for column in ServiceTag.__table__.columns}
+    
     async def get_with_service_count(
         self,
         db: AsyncSession,
         id: int
     ) -> Optional[dict]:
-        """Get tag with service count"""
+        """Get tag with its maintained service count"""
         tag = await self.get(db, id)
-        if not tag:
-            return None
-        
-        # Count services using this tag
-        count_result = await db.execute(
-            select(func.count(service_tags.c.service_id))
-            .filter(service_tags.c.tag_id == id)
-        )
-        service_count = count_result.scalar_one()
-        
-        return {
-            **tag.__dict__,
-            "service_count": service_count
-        }
+        return self.to_dict(tag) if tag else None
     
     async def get_all_with_service_count(
         self,
         db: AsyncSession
     ) -> List[dict]:
-        """Get all tags with service counts"""
-        # Get tags with services loaded
-        result = await db.execute(
-            select(ServiceTag)
-            .options(selectinload(ServiceTag.services))
-            .order_by(ServiceTag.name)
-        )
-        tags = result.scalars().all()
-        
-        # Build response with counts
-        response = []
-        for tag in tags:
-            response.append({
-                **tag.__dict__,
-                "service_count": len(tag.services)
-            })
+        """Get all tags with their maintained service counts, cached until tags change"""
+        async def load() -> List[dict]:
+            result = await db.execute(select(ServiceTag).order_by(ServiceTag.name))
+            return [self.to_dict(tag) for tag in result.scalars().all()]
         
-        return response
+        return await cache.get_or_load("tags:all", ("tags",), load)
     
     async def get_by_name(
         self,
@@ -99,6 +79,16 @@ class TagService(BaseService[ServiceTag]):
         if not source_tag or not target_tag:
             raise ValueError("Source or target tag not found")
         
+        # Drop links of services that already have the target tag, so the
+        # move below neither duplicates links nor double counts them
+        await db.execute(
+            service_tags.delete()
+            .where(service_tags.c.tag_id == source_tag_id)
+            .where(service_tags.c.service_id.in_(
+                select(service_tags.c.service_id).where(service_tags.c.tag_id == target_tag_id)
+            ))
+        )
+        
         # Update all services with source tag to use target tag
         await db.execute(
             service_tags.update()
@@ -109,6 +99,7 @@ class TagService(BaseService[ServiceTag]):
         # Delete source tag
         await db.delete(source_tag)
         await db.commit()
+        await db.refresh(target_tag)
         
         return target_tag
 
@@ -0,0 +1,151 @@
+"""Serialization benchmark for the service list and health statistics
+
+Seeds a throwaway SQLite database, then times, for ``/services`` and
+``/health/statistics``:
+
+- the response body built the validated way (``response_model`` validation,
+  ``model_dump`` and the standard JSON encoder), as the endpoints used to;
+- the body built the fast way (plain dicts encoded with orjson);
+- the full request through the app, both cold (read-through cache cleared
+  before every call) and cached (answered from the cache after the first).
+
+Usage: python benchmark.py [--services 500] [--iterations 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["HEALTH_CHECK_ENABLED"] = "False"
+
+import httpx
+import orjson
+
+from app.main import app
+from app.core.cache import cache
+from app.core.database import AsyncSessionLocal
+from app.models import Service, ServiceTag, Category, HealthCheckRecord, HealthStatus
+from app.models.health_check import now_epoch_ms
+from app.schemas.service import ServiceListResponse
+from app.schemas.health_check import HealthCheckStatistics
+from app.services.service import service_service, serialize_service
+from app.services.health_check import health_check_service
+
+
+async def seed(service_count: int) -> None:
+    """Create services with categories, tags and a few recent checks each"""
+    async with AsyncSessionLocal() as db:
+        categories = [Category(name=f"Category {i}") for i in range(10)]
+        tags = [ServiceTag(name=f"tag-{i}") for i in range(20)]
+        db.add_all(categories + tags)
+        await db.flush()
+        
+        now = now_epoch_ms()
+        for i in range(service_count):
+            service = Service(
+                name=f"Service {i}",
+                url=f"https://service-{i}.example.com",
+                description=f"Benchmark service number {i}",
+                category=random.choice(categories),
+                tags=random.sample(tags, 3),
+                status="active",
+                last_check_time=random.uniform(10, 500),
+                last_check_status=200
+            )
+            db.add(service)
+            await db.flush()
+            db.add_all([
+                HealthCheckRecord(
+                    service_id=service.id,
+                    checked_at=now - minute * 60000,
+                    status=HealthStatus.HEALTHY,
+                    status_code=200,
+                    response_time=random.uniform(10, 500)
+                )
+                for minute in range(5)
+            ])
+        await db.commit()
+
+
+def timed(func, iterations: int) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def encode_validated(model, payload) -> bytes:
+    # What response_model did: validate, dump to JSON types, encode with json
+    content = model.model_validate(payload).model_dump(mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+async def request_time(client: httpx.AsyncClient, url: str, iterations: int, cold: bool) -> float:
+    """Median milliseconds per request; cold requests skip every cached result"""
+    samples = []
+    for _ in range(iterations):
+        if cold:
+            cache.clear()
+            service_service._count_cache.clear()
+        start = time.perf_counter()
+        response = await client.get(url)
+        response.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main(service_count: int, iterations: int) -> None:
+    async with app.router.lifespan_context(app):
+        await seed(service_count)
+        
+        async with AsyncSessionLocal() as db:
+            services, total, next_cursor = await service_service.get_multi_with_relations(
+                db, limit=100, count="exact"
+            )
+            stats = await health_check_service.get_health_statistics(db)
+        
+        page = {"total": total, "page": 1, "size": 100, "has_more": next_cursor is not None, "next_cursor": next_cursor}
+        include = list(service_service.RELATIONS)
+        
+        rows = [
+            (
+                "/services (100 items)",
+                lambda: encode_validated(ServiceListResponse, {**page, "items": services}),
+                lambda: orjson.dumps({**page, "items": [serialize_service(s, None, include) for s in services]}),
+                "/api/v1/services/?size=100",
+            ),
+            (
+                f"/health/statistics ({service_count} services)",
+                lambda: encode_validated(HealthCheckStatistics, stats),
+                lambda: orjson.dumps(stats),
+                "/api/v1/health/statistics",
+            ),
+        ]
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            print(f"{'endpoint':<36}{'validated ms':>14}{'fast ms':>10}{'speedup':>9}{'cold ms':>10}{'cached ms':>11}")
+            for name, validated, fast, url in rows:
+                before = timed(validated, iterations)
+                after = timed(fast, iterations)
+                cold = await request_time(client, url, iterations, cold=True)
+                cached = await request_time(client, url, iterations, cold=False)
+                print(f"{name:<36}{before:>14.2f}{after:>10.2f}{before / after:>8.1f}x{cold:>10.2f}{cached:>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.services, args.iterations))
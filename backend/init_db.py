@@ -2,6 +2,7 @@
 
 import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import cache
 from app.core.database import engine, Base, AsyncSessionLocal
 from app.models import Category, Service, ServiceTag
 from app.services.service import service_service
@@ -177,6 +178,8 @@ async def init_db():
         categories = await init_categories(db)
         tags = await init_tags(db)
         await init_services(db, categories, tags)
+    # Let the shared data versions (with Redis) see the new rows
+    await cache.flush()
     
     print("Database initialization complete!")
 
@@ -0,0 +1,55 @@
+"""Shared fixtures: the app on a throwaway SQLite database
+
+The database URL is set before the app is imported, since settings and the
+engine are created at import time. One app instance serves the whole run;
+every test starts from empty tables.
+"""
+
+import os
+import tempfile
+
+DB_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(DB_DIR, 'test.db')}"
+os.environ["HEALTH_CHECK_ENABLED"] = "False"
+os.environ["CACHE_REDIS_ENABLED"] = "False"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app.main import app
+from app.core.cache import cache
+from app.core.database import Base, AsyncSessionLocal
+from app.services.anomaly import latency_detector
+from app.services.service import service_service
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def client(app_client):
+    """Client on empty tables, with in-process state reset"""
+    async def clear_tables():
+        # Through a session, so the data versions see the writes
+        async with AsyncSessionLocal() as db:
+            for table in reversed(Base.metadata.sorted_tables):
+                await db.execute(delete(table))
+            await db.commit()
+    
+    app_client.portal.call(clear_tables)
+    cache.clear()
+    service_service._count_cache.clear()
+    latency_detector.clear()
+    return app_client
+
+
+@pytest.fixture
+def run(client):
+    """Run a coroutine function on the app's event loop"""
+    def run(func, *args):
+        return client.portal.call(func, *args)
+    return run
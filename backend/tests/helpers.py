@@ -0,0 +1,22 @@
+"""Helpers creating rows through the API"""
+
+API = "/api/v1"
+
+
+def create_category(client, name, **fields):
+    response = client.post(f"{API}/categories/", json={"name": name, **fields})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_tag(client, name):
+    response = client.post(f"{API}/tags/", json={"name": name})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_service(client, name, **fields):
+    body = {"name": name, "url": f"https://{name}.example.com", **fields}
+    response = client.post(f"{API}/services/", json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
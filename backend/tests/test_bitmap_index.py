@@ -0,0 +1,91 @@
+"""The bitmap index must select the same services as the SQL filters"""
+
+import itertools
+import random
+
+from sqlalchemy import and_, select
+
+from app.core.database import AsyncSessionLocal
+from app.models import Category, Service, ServiceTag
+from app.services.bitmap_index import service_bitmap_index
+from app.services.service import service_service
+from tests.helpers import API
+
+
+def seed_catalog(run, count=40):
+    async def seed():
+        rng = random.Random(7)
+        async with AsyncSessionLocal() as db:
+            categories = [Category(name=f"category-{i}") for i in range(3)]
+            tags = [ServiceTag(name=f"tag-{i}") for i in range(4)]
+            db.add_all(categories + tags)
+            await db.flush()
+            for index in range(count):
+                db.add(Service(
+                    name=f"service-{index}",
+                    url=f"https://service-{index}.example.com",
+                    category=rng.choice(categories + [None]),
+                    tags=rng.sample(tags, rng.randint(0, 3)),
+                    status=rng.choice(["active", "inactive"]),
+                    is_active=rng.random() < 0.8
+                ))
+            await db.commit()
+            return [category.id for category in categories], [tag.id for tag in tags]
+    return run(seed)
+
+
+def filter_combinations(category_ids, tag_ids):
+    yield {"category_id": category_ids[0]}
+    yield {"category_ids": category_ids[1:]}
+    yield {"status": "inactive", "is_active": True}
+    for tag_id in tag_ids:
+        yield {"tag_ids": [tag_id]}
+    for pair in itertools.combinations(tag_ids, 2):
+        yield {"tag_ids": list(pair), "is_active": True}
+    yield {"tag_ids": [tag_ids[0]], "category_id": category_ids[1], "status": "active"}
+    yield {"service_ids": [1, 2, 3, 5, 8, 13], "tag_ids": [tag_ids[1]]}
+
+
+def assert_equivalent(run, category_ids, tag_ids):
+    async def compare():
+        async with AsyncSessionLocal() as db:
+            for filters in filter_combinations(category_ids, tag_ids):
+                indexed = await service_bitmap_index.lookup(db, **filters)
+                result = await db.execute(
+                    select(Service.id).filter(and_(*service_service.build_filters(**filters)))
+                )
+                assert sorted(indexed) == sorted(result.scalars().all()), filters
+    run(compare)
+
+
+def test_matches_sql_filters(client, run):
+    category_ids, tag_ids = seed_catalog(run)
+    assert_equivalent(run, category_ids, tag_ids)
+
+
+def test_matches_sql_filters_after_writes(client, run):
+    category_ids, tag_ids = seed_catalog(run)
+    assert_equivalent(run, category_ids, tag_ids)
+    
+    assert client.put(f"{API}/services/1", json={"tags": [tag_ids[0], tag_ids[3]], "category_id": category_ids[2]}).status_code == 200
+    assert client.post(f"{API}/services/", json={"name": "new", "url": "https://new.example.com", "tags": tag_ids[:2]}).status_code == 200
+    assert client.post(f"{API}/services/bulk/update", json={"service_ids": [2, 3, 4], "is_active": False, "category_id": category_ids[0]}).status_code == 200
+    assert client.post(f"{API}/services/bulk/delete", json={"service_ids": [5, 6]}).status_code == 200
+    assert client.delete(f"{API}/services/7").status_code == 200
+    assert client.post(f"{API}/tags/{tag_ids[2]}/merge/{tag_ids[1]}").status_code == 200
+    assert_equivalent(run, category_ids, [tag_ids[0], tag_ids[1], tag_ids[3]])
+
+
+def test_tag_writes_refresh_only_their_services(client, run):
+    category_ids, tag_ids = seed_catalog(run)
+    assert_equivalent(run, category_ids, tag_ids)
+    
+    assert client.put(f"{API}/services/1", json={"tags": [tag_ids[0]]}).status_code == 200
+    assert client.post(f"{API}/tags/", json={"name": "unused"}).status_code == 200
+    assert not service_bitmap_index._stale
+    assert service_bitmap_index._pending == {1}
+
+
+def test_ids_of_walks_set_bits():
+    assert service_bitmap_index.ids_of(0) == []
+    assert service_bitmap_index.ids_of(service_bitmap_index.bitmap_of([0, 3, 64, 1000])) == [0, 3, 64, 1000]
@@ -0,0 +1,122 @@
+"""Single-flight loading and shared versions of the read-through cache"""
+
+import asyncio
+
+from app.core.cache import TieredCache
+from app.core.data_version import data_versions
+
+
+class FakeRedis:
+    """The part of the Redis client the cache uses, kept in a dict"""
+    
+    def __init__(self):
+        self.values = {}
+    
+    async def get(self, key):
+        return self.values.get(key)
+    
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+    
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+    
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, b"0")) + 1).encode()
+        return int(self.values[key])
+
+
+def counting_loader(delay=0.05):
+    calls = []
+    
+    async def load():
+        calls.append(None)
+        await asyncio.sleep(delay)
+        return len(calls)
+    
+    return load, calls
+
+
+def test_concurrent_misses_share_one_load():
+    async def scenario():
+        cache = TieredCache(max_entries=10, ttl=30)
+        load, calls = counting_loader()
+        results = await asyncio.gather(*[cache.get_or_load("key", ("services",), load) for _ in range(5)])
+        return results, calls
+    
+    results, calls = asyncio.run(scenario())
+    assert results == [1] * 5
+    assert len(calls) == 1
+
+
+def test_waiters_retry_when_the_leader_is_cancelled():
+    async def scenario():
+        cache = TieredCache(max_entries=10, ttl=30)
+        load, calls = counting_loader()
+        leader = asyncio.create_task(cache.get_or_load("key", ("services",), load))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(cache.get_or_load("key", ("services",), load)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(leader, *waiters, return_exceptions=True)
+        return results, calls
+    
+    results, calls = asyncio.run(scenario())
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == [2, 2, 2]
+    assert len(calls) == 2
+
+
+def test_cancelled_waiter_leaves_the_leader_alone():
+    async def scenario():
+        cache = TieredCache(max_entries=10, ttl=30)
+        load, calls = counting_loader()
+        leader = asyncio.create_task(cache.get_or_load("key", ("services",), load))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get_or_load("key", ("services",), load))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        return await asyncio.gather(leader, waiter, return_exceptions=True)
+    
+    leader, waiter = asyncio.run(scenario())
+    assert leader == 1
+    assert isinstance(waiter, asyncio.CancelledError)
+
+
+def test_writes_invalidate_entries():
+    async def scenario():
+        cache = TieredCache(max_entries=10, ttl=30)
+        load, calls = counting_loader(delay=0)
+        first = await cache.get_or_load("key", ("tags",), load)
+        cached = await cache.get_or_load("key", ("tags",), load)
+        data_versions.bump({"tags": None})
+        reloaded = await cache.get_or_load("key", ("tags",), load)
+        return first, cached, reloaded
+    
+    assert asyncio.run(scenario()) == (1, 1, 2)
+
+
+def test_shared_versions_follow_other_writers():
+    async def scenario():
+        redis = FakeRedis()
+        cache = TieredCache(max_entries=10, ttl=30, redis=redis)
+        before = await cache.shared_versions(["services", "tags"])
+        # Another worker commits a write to tags
+        await redis.incr(cache._tag_key("tags"))
+        after = await cache.shared_versions(["services", "tags"])
+        # Redis is emptied and its counters start again
+        redis.values.clear()
+        emptied = await cache.shared_versions(["services", "tags"])
+        return before, after, emptied
+    
+    try:
+        before, after, emptied = asyncio.run(scenario())
+    finally:
+        data_versions._shared = None
+    assert before[1:] == [0, 0]
+    assert after == [before[0], 0, 1]
+    assert emptied[1:] == [0, 0]
+    assert emptied[0] != before[0]
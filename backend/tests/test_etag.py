@@ -0,0 +1,40 @@
+"""Weak ETags from data versions: 304 until the data is written"""
+
+from tests.helpers import API, create_category, create_service, create_tag
+
+
+def test_not_modified_until_written(client):
+    service = create_service(client, "one")
+    
+    response = client.get(f"{API}/services/")
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    
+    response = client.get(f"{API}/services/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    
+    client.put(f"{API}/services/{service['id']}", json={"name": "renamed"})
+    response = client.get(f"{API}/services/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["items"][0]["name"] == "renamed"
+
+
+def test_matches_any_listed_tag(client):
+    create_category(client, "Core")
+    etag = client.get(f"{API}/categories/").headers["etag"]
+    
+    response = client.get(f"{API}/categories/", headers={"If-None-Match": f'W/"stale", {etag}'})
+    assert response.status_code == 304
+    response = client.get(f"{API}/categories/", headers={"If-None-Match": "*"})
+    assert response.status_code == 304
+
+
+def test_writes_only_change_their_families(client):
+    etag = client.get(f"{API}/health/statistics").headers["etag"]
+    tags_etag = client.get(f"{API}/tags/").headers["etag"]
+    
+    create_tag(client, "a")
+    assert client.get(f"{API}/health/statistics", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"{API}/tags/", headers={"If-None-Match": tags_etag}).status_code == 200
@@ -0,0 +1,129 @@
+"""Startup migration of legacy health_check_records rows"""
+
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.migrations import run_migrations
+from app.models.health_check import HealthStatus, HealthCheckRollup, to_epoch_ms
+
+# Tables as written before the compact health check layout
+LEGACY_SCHEMA = [
+    """CREATE TABLE categories (
+        name VARCHAR(100) NOT NULL, icon VARCHAR(50), color VARCHAR(7), description TEXT,
+        sort_order INTEGER NOT NULL, id INTEGER NOT NULL PRIMARY KEY,
+        created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)""",
+    """CREATE TABLE tags (
+        name VARCHAR(50) NOT NULL, color VARCHAR(7), id INTEGER NOT NULL PRIMARY KEY,
+        created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)""",
+    """CREATE TABLE services (
+        name VARCHAR(200) NOT NULL, url VARCHAR(500) NOT NULL, description TEXT,
+        category_id INTEGER REFERENCES categories (id) ON DELETE SET NULL,
+        status VARCHAR(20) NOT NULL, is_active BOOLEAN NOT NULL, icon VARCHAR(500),
+        sort_order INTEGER NOT NULL, last_check_time FLOAT, last_check_status INTEGER,
+        uptime_percentage FLOAT, id INTEGER NOT NULL PRIMARY KEY,
+        created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)""",
+    """CREATE TABLE service_tags (
+        service_id INTEGER REFERENCES services (id) ON DELETE CASCADE,
+        tag_id INTEGER REFERENCES tags (id) ON DELETE CASCADE)""",
+    """CREATE TABLE health_check_records (
+        service_id INTEGER NOT NULL REFERENCES services (id) ON DELETE CASCADE,
+        status_code INTEGER, response_time FLOAT, is_healthy VARCHAR(20) NOT NULL,
+        error_message TEXT, id INTEGER NOT NULL PRIMARY KEY,
+        created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)""",
+]
+
+LEGACY_RECORDS = [
+    # id, is_healthy, status_code, response_time, error_message, created_at
+    (1, "healthy", 200, 10.5, None, datetime(2024, 5, 1, 12, 0, 0)),
+    (2, "unhealthy", None, None, "Connection failed", datetime(2024, 5, 1, 12, 1, 0)),
+    (3, "timeout", None, None, "Request timeout", datetime(2024, 5, 1, 12, 2, 0)),
+    (4, "unhealthy", None, None, "Connection failed", datetime(2024, 5, 1, 12, 3, 0, 250000)),
+    (5, "healthy", 200, 12.0, None, datetime(2024, 5, 1, 12, 4, 0)),
+]
+
+
+def legacy_database(path):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text(
+            "INSERT INTO services (id, name, url, status, is_active, sort_order, created_at, updated_at) "
+            "VALUES (1, 'one', 'https://one.example.com', 'active', 1, 0, '2024-05-01', '2024-05-01')"
+        ))
+        for id, is_healthy, status_code, response_time, error_message, created_at in LEGACY_RECORDS:
+            conn.execute(
+                text(
+                    "INSERT INTO health_check_records (id, service_id, is_healthy, status_code, "
+                    "response_time, error_message, created_at, updated_at) "
+                    "VALUES (:id, 1, :is_healthy, :status_code, :response_time, :error_message, :created_at, :created_at)"
+                ),
+                {
+                    "id": id,
+                    "is_healthy": is_healthy,
+                    "status_code": status_code,
+                    "response_time": response_time,
+                    "error_message": error_message,
+                    "created_at": created_at.isoformat(sep=" "),
+                }
+            )
+    return engine
+
+
+def test_legacy_records_are_converted(tmp_path):
+    engine = legacy_database(tmp_path / "legacy.db")
+    with engine.begin() as conn:
+        run_migrations(conn)
+    
+    with engine.connect() as conn:
+        columns = {column["name"] for column in inspect(conn).get_columns("health_check_records")}
+        assert "is_healthy" not in columns and "checked_at" in columns
+        assert "health_check_records_legacy" not in inspect(conn).get_table_names()
+        
+        errors = dict(conn.execute(text("SELECT message, id FROM health_check_errors")).all())
+        assert set(errors) == {"Connection failed", "Request timeout"}
+        
+        rows = conn.execute(text(
+            "SELECT id, checked_at, status, status_code, response_time, error_id "
+            "FROM health_check_records ORDER BY id"
+        )).all()
+        expected = [
+            (
+                id,
+                to_epoch_ms(created_at),
+                HealthStatus.from_label(is_healthy),
+                status_code,
+                response_time,
+                errors.get(error_message),
+            )
+            for id, is_healthy, status_code, response_time, error_message, created_at in LEGACY_RECORDS
+        ]
+        assert [tuple(row) for row in rows] == expected
+        
+        # Rollups and incidents are backfilled from the converted rows
+        totals = conn.execute(text(
+            "SELECT SUM(total_checks), SUM(healthy_checks) FROM health_check_rollups WHERE resolution = :resolution"
+        ), {"resolution": HealthCheckRollup.RESOLUTIONS[0]}).one()
+        assert tuple(totals) == (5, 2)
+        incidents = conn.execute(text("SELECT started_at, resolved_at FROM service_incidents")).all()
+        assert [tuple(row) for row in incidents] == [
+            (to_epoch_ms(LEGACY_RECORDS[1][5]), to_epoch_ms(LEGACY_RECORDS[4][5]))
+        ]
+        
+        # The categories and tags gained their maintained counts
+        assert "service_count" in {column["name"] for column in inspect(conn).get_columns("tags")}
+
+
+def test_migrations_are_idempotent(tmp_path):
+    engine = legacy_database(tmp_path / "legacy.db")
+    with engine.begin() as conn:
+        run_migrations(conn)
+    with engine.connect() as conn:
+        before = conn.execute(text("SELECT * FROM health_check_records ORDER BY id")).all()
+    
+    with engine.begin() as conn:
+        run_migrations(conn)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT * FROM health_check_records ORDER BY id")).all() == before
+        assert conn.execute(text("SELECT COUNT(*) FROM service_incidents")).scalar_one() == 1
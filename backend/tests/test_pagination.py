@@ -0,0 +1,54 @@
+"""Keyset cursors on the service list and health history"""
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+from tests.helpers import API, create_service
+
+
+def test_cursor_round_trip():
+    values = [3, "2024-01-02T03:04:05", 17]
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+def test_cursor_pages_cover_the_offset_listing(client):
+    for index in range(7):
+        create_service(client, f"service-{index}", sort_order=index % 3)
+    
+    listed = [item["id"] for item in client.get(f"{API}/services/", params={"size": 100}).json()["items"]]
+    
+    paged = []
+    params = {"size": 3}
+    while True:
+        body = client.get(f"{API}/services/", params=params).json()
+        paged.extend(item["id"] for item in body["items"])
+        if not body["next_cursor"]:
+            break
+        assert body["has_more"]
+        params = {"size": 3, "cursor": body["next_cursor"]}
+    
+    assert len(listed) == 7
+    assert paged == listed
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    encode_cursor({"sort_order": 1}),
+    encode_cursor([1, 2]),
+    encode_cursor([1, "not a date", 3]),
+    encode_cursor(["1", "2024-01-02T03:04:05", 3]),
+])
+def test_bad_service_cursor(client, cursor):
+    response = client.get(f"{API}/services/", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    encode_cursor([1]),
+    encode_cursor([1, "2"]),
+])
+def test_bad_history_cursor(client, cursor):
+    service = create_service(client, "one")
+    response = client.get(f"{API}/health/history/{service['id']}/records", params={"cursor": cursor})
+    assert response.status_code == 400
@@ -0,0 +1,100 @@
+"""Trigger-maintained service counts on categories and tags"""
+
+from sqlalchemy import update
+
+from app.core.database import engine
+from app.models import Category, ServiceTag
+from app.services.service_counts import service_counts
+from tests.helpers import API, create_category, create_service, create_tag
+
+
+def category_count(client, category_id):
+    return client.get(f"{API}/categories/{category_id}").json()["service_count"]
+
+
+def tag_count(client, tag_id):
+    return client.get(f"{API}/tags/{tag_id}").json()["service_count"]
+
+
+def test_create_and_update(client):
+    first = create_category(client, "First")
+    second = create_category(client, "Second")
+    a = create_tag(client, "a")
+    b = create_tag(client, "b")
+    
+    one = create_service(client, "one", category_id=first["id"], tags=[a["id"], b["id"]])
+    create_service(client, "two", category_id=first["id"], tags=[a["id"]])
+    assert category_count(client, first["id"]) == 2
+    assert tag_count(client, a["id"]) == 2
+    assert tag_count(client, b["id"]) == 1
+    
+    response = client.put(f"{API}/services/{one['id']}", json={"category_id": second["id"], "tags": [b["id"]]})
+    assert response.status_code == 200
+    assert category_count(client, first["id"]) == 1
+    assert category_count(client, second["id"]) == 1
+    assert tag_count(client, a["id"]) == 1
+    assert tag_count(client, b["id"]) == 1
+
+
+def test_tag_merge_counts_shared_services_once(client):
+    a = create_tag(client, "a")
+    b = create_tag(client, "b")
+    create_service(client, "both", tags=[a["id"], b["id"]])
+    create_service(client, "only-b", tags=[b["id"]])
+    
+    response = client.post(f"{API}/tags/{b['id']}/merge/{a['id']}")
+    assert response.status_code == 200
+    assert tag_count(client, a["id"]) == 2
+    assert client.get(f"{API}/tags/{b['id']}").status_code == 404
+
+
+def test_service_delete(client):
+    category = create_category(client, "Core")
+    tag = create_tag(client, "a")
+    service = create_service(client, "one", category_id=category["id"], tags=[tag["id"]])
+    create_service(client, "two", category_id=category["id"], tags=[tag["id"]])
+    
+    assert client.delete(f"{API}/services/{service['id']}").status_code == 200
+    assert category_count(client, category["id"]) == 1
+    assert tag_count(client, tag["id"]) == 1
+
+
+def test_category_delete(client):
+    doomed = create_category(client, "Doomed")
+    kept = create_category(client, "Kept")
+    tag = create_tag(client, "a")
+    create_service(client, "one", category_id=doomed["id"], tags=[tag["id"]])
+    create_service(client, "two", category_id=kept["id"], tags=[tag["id"]])
+    
+    assert client.delete(f"{API}/categories/{doomed['id']}").status_code == 200
+    assert tag_count(client, tag["id"]) == 1
+    assert category_count(client, kept["id"]) == 1
+
+
+def test_verify_and_repair(client, run):
+    category = create_category(client, "Core")
+    tag = create_tag(client, "a")
+    create_service(client, "one", category_id=category["id"], tags=[tag["id"]])
+    
+    async def corrupt():
+        async with engine.begin() as conn:
+            await conn.execute(update(Category.__table__).values(service_count=5))
+            await conn.execute(update(ServiceTag.__table__).values(service_count=0))
+    
+    async def verify():
+        async with engine.begin() as conn:
+            return await conn.run_sync(service_counts.verify)
+    
+    async def repair():
+        async with engine.begin() as conn:
+            return await conn.run_sync(service_counts.repair)
+    
+    assert run(verify) == []
+    run(corrupt)
+    mismatches = run(verify)
+    assert sorted((m["table"], m["id"], m["stored"], m["actual"]) for m in mismatches) == [
+        ("categories", category["id"], 5, 1),
+        ("tags", tag["id"], 0, 1),
+    ]
+    assert run(repair) == 2
+    assert run(verify) == []
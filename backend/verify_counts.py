@@ -0,0 +1,51 @@
+"""Verify the maintained service counts of categories and tags
+
+Compares every stored ``service_count`` with a recount and lists the rows
+that differ; ``--repair`` overwrites them with the recount. Exits with
+status 1 when mismatches were found and left in place. Repairs advance the
+shared data versions when Redis is configured; otherwise restart the server
+afterwards so its ETags change.
+
+Usage: python verify_counts.py [--repair]
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.core.cache import cache
+from app.core.data_version import data_versions
+from app.core.database import engine
+from app.services.service_counts import service_counts
+
+
+async def main(repair: bool) -> int:
+    async with engine.begin() as conn:
+        mismatches = await conn.run_sync(service_counts.verify)
+        for mismatch in mismatches:
+            print(
+                f"{mismatch['table']} {mismatch['id']}: "
+                f"stored {mismatch['stored']}, actual {mismatch['actual']}"
+            )
+        
+        if not mismatches:
+            print("All service counts are correct")
+            return 0
+        if not repair:
+            print(f"{len(mismatches)} service counts are wrong; run with --repair to fix them")
+            return 1
+        
+        fixed = await conn.run_sync(service_counts.repair)
+    
+    # Written outside a session, so no commit hook saw it
+    data_versions.bump({mismatch["table"]: None for mismatch in mismatches})
+    await cache.flush()
+    print(f"Repaired {fixed} service counts")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repair", action="store_true", help="overwrite wrong counts with a recount")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.repair)))